@@ -0,0 +1,73 @@
+"""Перевіряє розбір блоків на збереженому фікстурі.
+
+Запуск: python benchmarks/block_replay.py [blocks.jsonl [expected.json]]
+
+Кожен блок з файлу проходить через extract_transfers та
+extract_event_transfers, а множина адрес, що рухались, порівнюється з
+очікуваною з fixtures/blocks_sample_expected.json ({номер блоку: [адреси]}).
+Після зміни розбору або фікстура очікувані адреси оновлюються вручну.
+"""
+
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from block_scanner import (  # noqa: E402
+    ReplayBlockSource,
+    extract_event_transfers,
+    extract_transfers,
+)
+from tron import DEFAULT_TOKENS, parse_tokens  # noqa: E402
+
+
+def moved_addresses(source, number, tokens):
+    transfers = extract_transfers(source.get_block(number), tokens)
+    transfers += extract_event_transfers(source.get_transaction_infos(number), tokens)
+    return {
+        address for sender, receiver, _ in transfers for address in (sender, receiver)
+    }
+
+
+def main():
+    blocks_path = (
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else os.path.join(ROOT, "fixtures", "blocks_sample.jsonl")
+    )
+    expected_path = (
+        sys.argv[2]
+        if len(sys.argv) > 2
+        else os.path.join(ROOT, "fixtures", "blocks_sample_expected.json")
+    )
+    source = ReplayBlockSource(blocks_path)
+    with open(expected_path, encoding="utf-8") as file:
+        expected = {
+            int(number): set(addresses) for number, addresses in json.load(file).items()
+        }
+    tokens = parse_tokens(DEFAULT_TOKENS)
+
+    failed = 0
+    if set(source.blocks) != set(expected):
+        print(
+            f"❌ Набори блоків відрізняються: {sorted(set(source.blocks) ^ set(expected))}"
+        )
+        failed += 1
+    for number in sorted(set(source.blocks) & set(expected)):
+        moved = moved_addresses(source, number, tokens)
+        if moved != expected[number]:
+            print(
+                f"❌ Блок {number}: зайві {sorted(moved - expected[number])}, "
+                f"пропущені {sorted(expected[number] - moved)}"
+            )
+            failed += 1
+
+    if failed:
+        sys.exit(1)
+    print(f"✅ Розбір {len(expected)} блоків збігається з очікуваним")
+
+
+if __name__ == "__main__":
+    main()
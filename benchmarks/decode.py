@@ -0,0 +1,131 @@
+"""Порівнює розбір відповіді Tronscan /api/account: поточний шлях і новий.
+
+Запуск: python benchmarks/decode.py [кількість токенів на акаунті]
+
+"Було" - як у requests.Response.json(): decode утф-8 і json.loads, потім
+parse_account_balances. "Стало" - decode_account_balances() з json та з
+orjson (якщо встановлений). Окремо вимірюється пачка з 2000 відповідей у
+4 потоках, як у fetch_executor.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tron  # noqa: E402
+from tron import (  # noqa: E402
+    DEFAULT_TOKENS,
+    USDT_CONTRACT,
+    decode_account_balances,
+    parse_account_balances,
+    parse_tokens,
+)
+
+TOKENS = parse_tokens(DEFAULT_TOKENS)
+
+
+def token_entry(rng, contract):
+    return {
+        "tokenId": contract,
+        "balance": str(rng.randrange(10**12)),
+        "tokenName": f"Token {contract[:6]}",
+        "tokenAbbr": contract[:4],
+        "tokenDecimal": 6,
+        "tokenCanShow": 1,
+        "tokenType": "trc20",
+        "tokenLogo": f"https://static.tronscan.org/production/logo/{contract}.png",
+        "vip": False,
+        "tokenPriceInTrx": rng.random(),
+        "amount": rng.random() * 10**6,
+        "nrOfTokenHolders": rng.randrange(10**6),
+        "transferCount": rng.randrange(10**7),
+    }
+
+
+def make_payload(token_count, seed=42):
+    """Акаунт у форматі Tronscan з token_count токенами в кожному списку"""
+    rng = random.Random(seed)
+    contracts = [f"T{i:033d}" for i in range(token_count - 1)] + [USDT_CONTRACT]
+    rng.shuffle(contracts)
+    account = {
+        "address": "TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf",
+        "balance": rng.randrange(10**12),
+        "trc20token_balances": [token_entry(rng, c) for c in contracts],
+        "withPriceTokens": [token_entry(rng, c) for c in contracts],
+        "tokens": [token_entry(rng, c) for c in contracts],
+        "bandwidth": {f"field_{i}": rng.randrange(10**9) for i in range(30)},
+        "ownerPermission": {
+            "keys": [{"address": "T" + "1" * 33, "weight": 1}],
+            "threshold": 1,
+            "permission_name": "owner",
+        },
+        "activePermissions": [
+            {
+                "operations": "7fff1fc0033e0000000000000000000000000000000000000000000000000000",
+                "keys": [{"address": "T" + "2" * 33, "weight": 1}],
+                "threshold": 1,
+                "id": 2,
+                "type": "Active",
+                "permission_name": "active",
+            }
+        ],
+        "frozen_supply": [],
+        "accountType": 0,
+        "date_created": 1600000000000,
+        "transactions": rng.randrange(10**5),
+    }
+    return json.dumps(account).encode()
+
+
+def old_decode(raw):
+    return parse_account_balances(json.loads(raw.decode("utf-8")), TOKENS)
+
+
+def measure(function, raw, runs):
+    started = time.perf_counter()
+    for _ in range(runs):
+        function(raw)
+    return (time.perf_counter() - started) / runs * 1_000_000
+
+
+def measure_batch(executor, responses):
+    started = time.perf_counter()
+    list(executor.map(lambda r: decode_account_balances(r, TOKENS), responses))
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    token_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    raw = make_payload(token_count)
+    runs = 500
+
+    expected = old_decode(raw)
+    assert decode_account_balances(raw, TOKENS) == expected
+
+    print(f"Розмір відповіді: {len(raw) / 1024:.1f} КБ, токенів: {token_count}")
+    old_us = measure(old_decode, raw, runs)
+    print(f"Було (decode + json.loads):        {old_us:8.1f} мкс на відповідь")
+
+    orjson_module = tron.orjson
+    tron.orjson = None
+    json_us = measure(lambda r: decode_account_balances(r, TOKENS), raw, runs)
+    tron.orjson = orjson_module
+    print(f"Стало, json:                       {json_us:8.1f} мкс на відповідь")
+    if orjson_module is not None:
+        fast_us = measure(lambda r: decode_account_balances(r, TOKENS), raw, runs)
+        print(f"Стало, orjson:                     {fast_us:8.1f} мкс на відповідь")
+    else:
+        print("orjson не встановлено (pip install orjson)")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threads_ms = measure_batch(executor, [raw] * 2000)
+    print(f"Пачка 2000 відповідей, 4 потоки:   {threads_ms:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Перевіряє пул endpoint'ів на локальних stub-серверах.
+
+Кожен stub відповідає у форматі Tronscan (або TronGrid) із затримкою 20 мс.
+Скрипт показує, що пропускна здатність росте з кількістю ключів, а збійний
+та throttling-учасники виключаються з пулу.
+
+Запуск: python benchmarks/endpoint_pool.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tron_pool import EndpointPool, PoolMember  # noqa: E402
+
+USDT = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+LATENCY = 0.02
+
+
+def start_stub(mode="ok"):
+    """Піднімає stub-сервер; mode: ok, trongrid, error, throttle"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(LATENCY)
+            if mode == "error":
+                self.send_response(500)
+                self.end_headers()
+                return
+            if mode == "throttle":
+                self.send_response(429)
+                self.send_header("Retry-After", "60")
+                self.end_headers()
+                return
+
+            if mode == "trongrid":
+                body = {"data": [{"balance": 1_000_000, "trc20": [{USDT: "5000000"}]}]}
+            else:
+                body = {
+                    "balance": 1_000_000,
+                    "trc20token_balances": [
+                        {"tokenId": USDT, "balance": "5000000", "tokenDecimal": 6}
+                    ],
+                }
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    if mode == "trongrid":
+        return f"http://{host}:{port}"
+    return f"http://{host}:{port}/api/account?address="
+
+
+def run(pool, requests_count):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=pool.concurrency) as executor:
+        results = list(executor.map(pool.fetch_account, [USDT] * requests_count))
+    elapsed = time.perf_counter() - started
+    assert all(result["trc20token_balances"] for result in results)
+    return requests_count / elapsed
+
+
+def main():
+    rps = 10
+    for keys in (1, 2, 4):
+        members = [
+            PoolMember("tronscan", start_stub(), f"key-{i}", rps=rps)
+            for i in range(keys)
+        ]
+        throughput = run(EndpointPool(members), rps * keys * 3)
+        print(f"{keys} ключ(і) по {rps} rps: {throughput:.1f} запитів/с")
+
+    members = [
+        PoolMember("tronscan", start_stub(), "key-ok", rps=20, weight=2),
+        PoolMember("trongrid", start_stub("trongrid"), "key-grid", rps=20),
+        PoolMember("tronscan", start_stub("error"), "key-broken", rps=20),
+        PoolMember("tronscan", start_stub("throttle"), "key-throttled", rps=20),
+    ]
+    pool = EndpointPool(members)
+    throughput = run(pool, 200)
+    print(f"Пул зі збійними учасниками: {throughput:.1f} запитів/с")
+    for url, requests_count, errors, ejected in pool.stats():
+        state = "виключено" if ejected else "активний"
+        print(f"  {url}: запитів {requests_count}, помилок {errors}, {state}")
+
+
+if __name__ == "__main__":
+    main()
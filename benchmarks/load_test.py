@@ -0,0 +1,286 @@
+"""Навантажувальний тест обробників bot.py.
+
+Синтетичні Update подаються напряму в dp.feed_update з підміненою сесією Bot
+(без запитів до Telegram) на тимчасовій SQLite базі з тестовими даними.
+Звіт: p50/p95/p99 затримки обробника, кількість запитів до БД на один update
+та затримка event loop при заданій паралельності.
+
+Запуск: python benchmarks/load_test.py --users 300 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import contextvars
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ADMIN_ID = 1
+
+DEFAULT_TEXTS = "💰 Баланс,📋 Мої гаманці,/start"
+
+# Лічильник запитів до БД для update, що обробляється в поточній задачі
+db_calls = contextvars.ContextVar("db_calls", default=None)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--updates-per-user", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--wallets", type=int, default=1000)
+    parser.add_argument(
+        "--texts",
+        default=DEFAULT_TEXTS,
+        help="тексти повідомлень через кому (кнопки або команди)",
+    )
+    parser.add_argument(
+        "--throttling",
+        action="store_true",
+        help="не вимикати обмеження частоти команд (ThrottlingMiddleware)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def configure_environment(throttling):
+    """Налаштовує змінні середовища до імпорту bot.py"""
+    fd, db_path = tempfile.mkstemp(prefix="load_test_", suffix=".db")
+    os.close(fd)
+    os.environ["DB_NAME"] = db_path
+    os.environ.pop("DATABASE_URL", None)
+    os.environ["BOT_TOKEN"] = "123456:LOAD-TEST"
+    os.environ["DEFAULT_ADMIN_ID"] = str(ADMIN_ID)
+    os.environ["RATE_LIMIT_ENABLED"] = "1" if throttling else "0"
+    os.environ.setdefault("TRONSCAN_API_URL", "http://127.0.0.1:9/api/account?address=")
+    return db_path
+
+
+async def seed_database(db_path, users, wallets, rng):
+    import aiosqlite
+
+    import database
+
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            """
+            CREATE TABLE users (
+                user_id INTEGER PRIMARY KEY,
+                username TEXT,
+                is_approved INTEGER DEFAULT 0,
+                is_admin INTEGER DEFAULT 0,
+                is_subscribed INTEGER DEFAULT 0
+            )
+            """
+        )
+        await db.execute(
+            """
+            CREATE TABLE wallets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                name TEXT,
+                address TEXT UNIQUE,
+                balance REAL DEFAULT 0,
+                last_balance REAL DEFAULT 0
+            )
+            """
+        )
+        await db.executemany(
+            "INSERT INTO users (user_id, username, is_approved, is_admin, is_subscribed) "
+            "VALUES (?, ?, 1, ?, ?)",
+            [
+                (user_id, f"user_{user_id}", int(user_id == ADMIN_ID), user_id % 2)
+                for user_id in range(ADMIN_ID, ADMIN_ID + users)
+            ],
+        )
+        await db.executemany(
+            "INSERT INTO wallets (user_id, name, address, last_balance) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    ADMIN_ID + index % users,
+                    f"wallet_{index}",
+                    f"T{index:033d}",
+                    round(rng.uniform(0, 1000), 2),
+                )
+                for index in range(wallets)
+            ],
+        )
+        await db.commit()
+
+    await database.update_db_schema()
+    await database.load_wallet_registry()
+
+
+def install_db_counter():
+    """Рахує запити до БД (execute/executemany) для кожного update окремо"""
+    import aiosqlite
+
+    for name in ("execute", "executemany"):
+        original = getattr(aiosqlite.Connection, name)
+
+        def counted(self, *args, _original=original, **kwargs):
+            counter = db_calls.get()
+            if counter is not None:
+                counter[0] += 1
+            return _original(self, *args, **kwargs)
+
+        setattr(aiosqlite.Connection, name, counted)
+
+
+def create_mock_session():
+    from aiogram.client.session.base import BaseSession
+    from aiogram.methods import SendDocument, SendMessage
+    from aiogram.types import Chat, Message
+
+    class MockSession(BaseSession):
+        """Сесія Bot, що одразу відповідає замість запитів до Telegram API"""
+
+        def __init__(self):
+            super().__init__()
+            self.calls = Counter()
+
+        async def make_request(self, bot, method, timeout=None):
+            self.calls[type(method).__name__] += 1
+            if isinstance(method, (SendMessage, SendDocument)):
+                return Message(
+                    message_id=1,
+                    date=datetime.now(),
+                    chat=Chat(id=method.chat_id, type="private"),
+                    text=getattr(method, "text", None),
+                )
+            return True
+
+        async def stream_content(
+            self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True
+        ):
+            yield b""
+
+        async def close(self):
+            pass
+
+    return MockSession()
+
+
+def make_update(update_id, user_id, text):
+    from aiogram.types import Chat, Message, Update, User
+
+    return Update(
+        update_id=update_id,
+        message=Message(
+            message_id=update_id,
+            date=datetime.now(),
+            chat=Chat(id=user_id, type="private"),
+            from_user=User(id=user_id, is_bot=False, first_name=f"user_{user_id}"),
+            text=text,
+        ),
+    )
+
+
+async def monitor_loop_lag(samples, interval=0.01):
+    """Вимірює, наскільки пізніше за заплановане прокидається event loop"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - started - interval)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def print_report(title, values, unit_scale=1000, unit="мс"):
+    print(
+        f"{title:<28} p50 {percentile(values, 50) * unit_scale:8.2f} {unit}   "
+        f"p95 {percentile(values, 95) * unit_scale:8.2f} {unit}   "
+        f"p99 {percentile(values, 99) * unit_scale:8.2f} {unit}   "
+        f"max {max(values, default=0) * unit_scale:8.2f} {unit}"
+    )
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    db_path = configure_environment(args.throttling)
+
+    try:
+        await seed_database(db_path, args.users, args.wallets, rng)
+        install_db_counter()
+
+        import bot as bot_module
+
+        # Рядок логу на кожен update спотворює заміри
+        logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+
+        bot = bot_module.bot
+        bot.session = create_mock_session()
+        dp = bot_module.dp
+
+        texts = [text.strip() for text in args.texts.split(",") if text.strip()]
+        updates = [
+            (user_id, rng.choice(texts))
+            for user_id in range(ADMIN_ID, ADMIN_ID + args.users)
+            for _ in range(args.updates_per_user)
+        ]
+        rng.shuffle(updates)
+
+        latencies = {text: [] for text in texts}
+        calls = {text: [] for text in texts}
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def feed(update_id, user_id, text):
+            async with semaphore:
+                counter = [0]
+                db_calls.set(counter)
+                started = time.perf_counter()
+                await dp.feed_update(bot, make_update(update_id, user_id, text))
+                latencies[text].append(time.perf_counter() - started)
+                calls[text].append(counter[0])
+
+        lag_samples = []
+        lag_task = asyncio.create_task(monitor_loop_lag(lag_samples))
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                asyncio.create_task(feed(update_id, user_id, text))
+                for update_id, (user_id, text) in enumerate(updates, start=1)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        lag_task.cancel()
+
+        print(
+            f"Користувачів: {args.users}, update: {len(updates)}, "
+            f"паралельно: {args.concurrency}, гаманців: {args.wallets}"
+        )
+        print(f"Загальний час: {elapsed:.2f} с ({len(updates) / elapsed:.0f} update/с)")
+        print()
+        for text in texts:
+            if latencies[text]:
+                print_report(f"{text} ({len(latencies[text])})", latencies[text])
+                print(
+                    f"{'':<28} запитів до БД на update: "
+                    f"{statistics.mean(calls[text]):.1f} (max {max(calls[text])})"
+                )
+        print()
+        print_report("Затримка event loop", lag_samples)
+        print(f"Виклики Bot API: {dict(bot.session.calls)}")
+    finally:
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,97 @@
+"""Порівнює витрати на логування в циклі перевірки балансів.
+
+Запуск: python benchmarks/logging_overhead.py [N гаманців]
+
+"Було" - рядок logging.info з f-string на кожен гаманець через синхронний
+StreamHandler. "Стало" - logging.debug з %-аргументами (при рівні INFO
+пропускається без форматування) і один підсумковий запис на цикл через
+setup_logging(). Вимірюється час, який логування забирає у потоку event
+loop, вивід іде у файл.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_setup import setup_logging, stop_logging  # noqa: E402
+
+
+def make_wallets(count):
+    return [
+        (f"wallet_{i}", f"T{i:033d}", i * 0.5, i * 0.5 + (i % 7 == 0))
+        for i in range(count)
+    ]
+
+
+def old_cycle(wallets):
+    logging.info(f"🔄 Початок перевірки балансів, знайдено {len(wallets)} гаманців")
+    for name, address, last_balance, new_balance in wallets:
+        logging.info(
+            f"🔍 Гаманець {name} ({address}): старий баланс {last_balance} USDT, новий баланс {new_balance} USDT"
+        )
+
+
+def new_cycle(wallets):
+    logging.info("🔄 Початок перевірки балансів, знайдено %d гаманців", len(wallets))
+    stats = {"wallets": len(wallets), "changed": 0}
+    for name, address, last_balance, new_balance in wallets:
+        logging.debug(
+            "🔍 Гаманець %s (%s): старий баланс %s USDT, новий баланс %s USDT",
+            name,
+            address,
+            last_balance,
+            new_balance,
+        )
+        if new_balance != last_balance:
+            stats["changed"] += 1
+    logging.info(
+        "✅ Перевірка балансів завершена: %d гаманців, змінилось %d",
+        stats["wallets"],
+        stats["changed"],
+        extra={"cycle": stats},
+    )
+
+
+def measure(cycle, wallets, runs=5):
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        cycle(wallets)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    wallets = make_wallets(count)
+
+    with tempfile.TemporaryFile("w") as output:
+        root = logging.getLogger()
+        handler = logging.StreamHandler(output)
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        old_ms = measure(old_cycle, wallets)
+        root.removeHandler(handler)
+
+    with tempfile.TemporaryFile("w") as output:
+        listener = setup_logging("INFO", "json", stream=output)
+        new_ms = measure(new_cycle, wallets)
+        debug_level = logging.getLogger().level
+        logging.getLogger().setLevel(logging.DEBUG)
+        # При LOG_LEVEL=DEBUG рядки гаманців форматує потік логера, а не loop
+        debug_ms = measure(new_cycle, wallets[:1000], runs=1)
+        logging.getLogger().setLevel(debug_level)
+        stop_logging(listener)
+
+    print(f"Гаманців у циклі: {count}")
+    print(f"Було (f-string info на кожен гаманець): {old_ms:8.2f} мс на цикл")
+    print(f"Стало (debug + підсумок, черга):       {new_ms:8.2f} мс на цикл")
+    print(f"LOG_LEVEL=DEBUG, 1000 гаманців:         {debug_ms:8.2f} мс у потоці loop")
+
+
+if __name__ == "__main__":
+    main()
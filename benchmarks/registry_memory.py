@@ -0,0 +1,86 @@
+"""Вимірює пам'ять реєстру гаманців на N записах.
+
+Запуск: python benchmarks/registry_memory.py [N]
+"""
+
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wallet_registry import WalletRegistry  # noqa: E402
+
+ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def make_rows(count):
+    rng = random.Random(42)
+    return [
+        (
+            1000 + i % 5,
+            f"wallet_{i}",
+            "T" + "".join(rng.choice(ALPHABET) for _ in range(33)),
+            round(rng.uniform(0, 10_000), 2),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = make_rows(count)
+    encoded = [(u, n.encode(), a.encode(), b) for u, n, a, b in rows]
+
+    def fresh():
+        # Рядки створюються заново, як після fetchall() з бази
+        return [(u, n.decode(), a.decode(), b) for u, n, a, b in encoded]
+
+    _, tuples_size, _ = measure(fresh)
+
+    def build_registry():
+        registry = WalletRegistry()
+        registry.load(fresh())
+        return registry
+
+    registry, registry_size, _ = measure(build_registry)
+
+    fetched = fresh()
+    started = time.perf_counter()
+    WalletRegistry().load(fetched)
+    load_time = time.perf_counter() - started
+
+    addresses = [row[2] for row in rows[:: max(1, count // 1000)]]
+    started = time.perf_counter()
+    for address in addresses:
+        registry.get(address)
+    lookup_us = (time.perf_counter() - started) / len(addresses) * 1e6
+
+    started = time.perf_counter()
+    registry.all()
+    snapshot_ms = (time.perf_counter() - started) * 1000
+
+    print(f"wallets:               {count}")
+    print(f"fetchall() tuples:     {tuples_size / 2**20:.1f} MiB")
+    print(f"WalletRegistry:        {registry_size / 2**20:.1f} MiB")
+    print(f"bytes per wallet:      {registry_size / count:.0f}")
+    print(f"load time:             {load_time * 1000:.0f} ms")
+    print(f"lookup by address:     {lookup_us:.2f} us")
+    print(f"all() snapshot:        {snapshot_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
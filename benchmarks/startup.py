@@ -0,0 +1,102 @@
+"""Вимірює час запуску бота: імпорт bot.py і шлях main() до готовності.
+
+Запуск: python benchmarks/startup.py [N гаманців]
+
+Імпорт вимірюється в окремому процесі (як при рестарті), шлях main() -
+на тимчасовій SQLite базі: перший запуск з міграцією схеми і повторний,
+де міграції пропускаються за PRAGMA user_version.
+"""
+
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def create_database(path, count):
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE users (user_id INTEGER PRIMARY KEY, username TEXT, "
+        "is_approved INTEGER DEFAULT 0, is_admin INTEGER DEFAULT 0)"
+    )
+    db.execute(
+        "CREATE TABLE wallets (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, "
+        "name TEXT, address TEXT UNIQUE, balance REAL DEFAULT 0)"
+    )
+    db.executemany(
+        "INSERT INTO wallets (user_id, name, address) VALUES (?, ?, ?)",
+        ((1000 + i % 5, f"wallet_{i}", f"T{i:033d}") for i in range(count)),
+    )
+    db.commit()
+    db.close()
+
+
+def measure_import(env, runs=3):
+    """Найкращий час `import bot` у новому процесі, мс"""
+    code = (
+        "import sys, time; sys.path.insert(0, sys.argv[1]); started = time.perf_counter(); "
+        "import bot; print((time.perf_counter() - started) * 1000)"
+    )
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code, ROOT],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(float(output.strip().splitlines()[-1]))
+    return min(results)
+
+
+async def measure_main_path():
+    """Те саме, що main() робить до сигналу готовності"""
+    import database
+
+    started = time.perf_counter()
+    migrated = await database.update_db_schema()
+    schema_ms = (time.perf_counter() - started) * 1000
+    await asyncio.gather(
+        database.load_wallet_registry(), database.ensure_default_admin()
+    )
+    total_ms = (time.perf_counter() - started) * 1000
+    return migrated, schema_ms, total_ms, len(database.registry)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    fd, db_path = tempfile.mkstemp(prefix="startup_", suffix=".db")
+    os.close(fd)
+    create_database(db_path, count)
+
+    os.environ.update(
+        DB_NAME=db_path,
+        BOT_TOKEN="123456:STARTUP",
+        DEFAULT_ADMIN_ID="1000",
+        TRONSCAN_API_URL="http://127.0.0.1:9/api/account?address=",
+    )
+    os.environ.pop("DATABASE_URL", None)
+    env = dict(os.environ)
+
+    try:
+        print(f"Імпорт bot.py: {measure_import(env):.0f} мс")
+        for label in ("перший запуск", "повторний запуск"):
+            migrated, schema_ms, total_ms, loaded = asyncio.run(measure_main_path())
+            print(
+                f"main() до готовності, {label}: {total_ms:.0f} мс "
+                f"(схема {schema_ms:.1f} мс, міграція: {'так' if migrated else 'ні'}, "
+                f"гаманців {loaded})"
+            )
+    finally:
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import logging
+import sys
+
+import requests
+
+from tron import hex_to_base58
+
+TRANSFER_SELECTOR = "a9059cbb"  # transfer(address,uint256)
+TRANSFER_FROM_SELECTOR = "23b872dd"  # transferFrom(address,address,uint256)
+# Подія Transfer(address,address,uint256) стандарту TRC20
+TRANSFER_EVENT_TOPIC = (
+    "ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+)
+
+# Середній інтервал між блоками TRON
+BLOCK_INTERVAL = 3
+# Найдовша пауза між проходами після помилок сканування поспіль
+MAX_ERROR_BACKOFF = 60
+
+
+class NodeBlockSource:
+    """Отримує блоки з HTTP API ноди TRON (java-tron, TronGrid)"""
+
+    def __init__(self, url, api_key=None, timeout=10):
+        self.url = url.rstrip("/")
+        self.headers = {"TRON-PRO-API-KEY": api_key} if api_key else None
+        self.timeout = timeout
+
+    def _post(self, path, payload=None):
+        response = requests.post(
+            f"{self.url}{path}",
+            json=payload or {},
+            headers=self.headers,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def latest_block_number(self):
+        block = self._post("/wallet/getnowblock")
+        return block["block_header"]["raw_data"]["number"]
+
+    def get_block(self, number):
+        return self._post("/wallet/getblockbynum", {"num": number})
+
+    def get_transaction_infos(self, number):
+        """Результати виконання транзакцій блоку: журнали подій і внутрішні перекази"""
+        infos = self._post("/wallet/gettransactioninfobyblocknum", {"num": number})
+        return infos if isinstance(infos, list) else []
+
+
+class ReplayBlockSource:
+    """Віддає блоки з локального JSON Lines файлу (один блок на рядок).
+
+    Результати транзакцій блоку (як з gettransactioninfobyblocknum) можна
+    покласти в поле "transaction_info" самого блоку.
+    """
+
+    def __init__(self, path):
+        self.blocks = {}
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    block = json.loads(line)
+                    self.blocks[block["block_header"]["raw_data"]["number"]] = block
+
+    def latest_block_number(self):
+        return max(self.blocks)
+
+    def get_block(self, number):
+        return self.blocks.get(number, {})
+
+    def get_transaction_infos(self, number):
+        return self.blocks.get(number, {}).get("transaction_info", [])
+
+
+def _abi_address(word):
+    """Адреса з 32-байтного ABI-аргументу (hex) у форматі base58"""
+    return hex_to_base58("41" + word[-40:])
+
+
+def extract_transfers(block, tokens):
+    """Повертає перекази блоку як (from, to, token) з адресами у форматі base58.
+
+    Враховуються переказ TRX (TransferContract) та виклики transfer/transferFrom
+    контрактів з tokens ({contract: ...}). TRX позначається як "_".
+    """
+    transfers = []
+
+    for transaction in block.get("transactions", []):
+        for contract in transaction.get("raw_data", {}).get("contract", []):
+            value = contract.get("parameter", {}).get("value", {})
+            kind = contract.get("type")
+
+            if kind == "TransferContract":
+                transfers.append(
+                    (
+                        hex_to_base58(value["owner_address"]),
+                        hex_to_base58(value["to_address"]),
+                        "_",
+                    )
+                )
+
+            elif kind == "TriggerSmartContract":
+                token = hex_to_base58(value.get("contract_address", ""))
+                data = value.get("data", "")
+                if token not in tokens:
+                    continue
+
+                selector, args = data[:8], data[8:]
+                if selector == TRANSFER_SELECTOR and len(args) >= 128:
+                    sender = hex_to_base58(value["owner_address"])
+                    transfers.append((sender, _abi_address(args[:64]), token))
+                elif selector == TRANSFER_FROM_SELECTOR and len(args) >= 192:
+                    transfers.append(
+                        (_abi_address(args[:64]), _abi_address(args[64:128]), token)
+                    )
+
+    return transfers
+
+
+def extract_event_transfers(infos, tokens):
+    """Повертає перекази з результатів транзакцій блоку як (from, to, token).
+
+    Враховуються події Transfer контрактів з tokens, тож видно і перекази,
+    виконані через інший контракт (виплати бірж пачками, мультипідписи,
+    роутери DEX), а також внутрішні перекази TRX між контрактами.
+    """
+    transfers = []
+
+    for info in infos:
+        for log in info.get("log", []):
+            topics = log.get("topics", [])
+            if len(topics) < 3 or topics[0] != TRANSFER_EVENT_TOPIC:
+                continue
+            token = hex_to_base58("41" + log.get("address", "")[-40:])
+            if token in tokens:
+                transfers.append(
+                    (_abi_address(topics[1]), _abi_address(topics[2]), token)
+                )
+
+        if "_" not in tokens:
+            continue
+        for internal in info.get("internal_transactions", []):
+            if internal.get("rejected"):
+                continue
+            # callValue без tokenId - TRX, з tokenId - токен TRC10
+            if any(
+                value.get("callValue") and "tokenId" not in value
+                for value in internal.get("callValueInfo", [])
+            ):
+                transfers.append(
+                    (
+                        hex_to_base58(internal["caller_address"]),
+                        hex_to_base58(internal["transferTo_address"]),
+                        "_",
+                    )
+                )
+
+    return transfers
+
+
+class BlockScanner:
+    """Стежить за новими блоками і повідомляє, які з відстежуваних гаманців рухались.
+
+    Вартість - два запити на блок (сам блок і результати його транзакцій)
+    незалежно від кількості гаманців. watched -
+    множина адрес (або будь-що з `in`, наприклад WalletRegistry). Курсор
+    останнього обробленого блоку зберігається через load_cursor/save_cursor,
+    тож після перезапуску сканування продовжується з того ж місця. Без
+    збереженого курсора сканування починається після start_cursor, а якщо
+    його не задано - з поточного блоку. Після stop_event.set() сканер
+    дообробляє поточний блок, зберігає курсор і завершує run().
+    """
+
+    def __init__(
+        self,
+        source,
+        watched,
+        tokens,
+        on_moved,
+        load_cursor,
+        save_cursor,
+        confirmations=1,
+        max_catchup=1200,
+        on_gap=None,
+        start_cursor=None,
+        stop_event=None,
+    ):
+        self.source = source
+        self.watched = watched
+        self.tokens = tokens
+        self.on_moved = on_moved
+        self.load_cursor = load_cursor
+        self.save_cursor = save_cursor
+        self.confirmations = confirmations
+        self.max_catchup = max_catchup
+        self.on_gap = on_gap
+        self.start_cursor = start_cursor
+        self.stop_event = stop_event or asyncio.Event()
+
+    async def scan_once(self):
+        """Обробляє всі нові блоки; повертає кількість оброблених блоків"""
+        latest = await asyncio.to_thread(self.source.latest_block_number)
+        target = latest - self.confirmations + 1
+        cursor = await self.load_cursor()
+        if cursor is None:
+            cursor = self.start_cursor
+
+        if cursor is None or (self.on_gap and target - cursor > self.max_catchup):
+            # Перший запуск або надто довга перерва: стан береться повним
+            # опитуванням, а сканування починається з поточного блоку
+            if cursor is not None:
+                logging.warning(
+                    "⚠️ Пропущено %d блоків, виконуємо повну перевірку", target - cursor
+                )
+                await self.on_gap()
+            await self.save_cursor(target)
+            return 0
+
+        for number in range(cursor + 1, target + 1):
+            if self.stop_event.is_set():
+                return number - cursor - 1
+            block, infos = await asyncio.gather(
+                asyncio.to_thread(self.source.get_block, number),
+                asyncio.to_thread(self.source.get_transaction_infos, number),
+            )
+            # Нода могла ще не мати блоку (поверне {}) або віддати інший:
+            # курсор не рухається, блок повторюється в наступному проході
+            header = block.get("block_header", {}).get("raw_data", {})
+            if header.get("number") != number:
+                logging.warning(
+                    "⚠️ Блок %d недоступний (отримано %s), повторимо пізніше",
+                    number,
+                    header.get("number"),
+                )
+                return number - cursor - 1
+            transfers = extract_transfers(block, self.tokens)
+            transfers += extract_event_transfers(infos, self.tokens)
+            moved = {
+                address
+                for sender, receiver, _ in transfers
+                for address in (sender, receiver)
+                if address in self.watched
+            }
+            if moved:
+                logging.info("🧱 Блок %d: рух на %d гаманцях", number, len(moved))
+                await self.on_moved(moved)
+            await self.save_cursor(number)
+
+        return max(0, target - cursor)
+
+    async def run(self):
+        errors = 0
+        while not self.stop_event.is_set():
+            try:
+                processed = await self.scan_once()
+                errors = 0
+            except requests.RequestException as e:
+                logging.error("⚠️ Помилка сканування блоків: %s", e)
+                processed, errors = 0, errors + 1
+            except Exception:
+                # Будь-яка інша помилка (зламаний блок, збій БД чи on_moved)
+                # не повинна зупиняти сканер назавжди
+                logging.exception("⚠️ Неочікувана помилка сканування блоків")
+                processed, errors = 0, errors + 1
+            if not processed:
+                delay = min(BLOCK_INTERVAL * 2**errors, MAX_ERROR_BACKOFF)
+                try:
+                    await asyncio.wait_for(self.stop_event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+
+if __name__ == "__main__":
+    # python block_scanner.py fixtures/blocks_sample.jsonl [адреса ...]
+    from tron import DEFAULT_TOKENS, parse_tokens
+
+    source = ReplayBlockSource(sys.argv[1])
+    watched = set(sys.argv[2:])
+    tokens = parse_tokens(DEFAULT_TOKENS)
+
+    for number in sorted(source.blocks):
+        transfers = extract_transfers(source.get_block(number), tokens)
+        transfers += extract_event_transfers(
+            source.get_transaction_infos(number), tokens
+        )
+        for sender, receiver, token in dict.fromkeys(transfers):
+            mark = "👀" if sender in watched or receiver in watched else "  "
+            symbol = tokens.get(token, (token,))[0]
+            print(f"{mark} {number}: {sender} -> {receiver} ({symbol})")
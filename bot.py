@@ -1,14 +1,20 @@
 import logging
 import os
 import asyncio
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
-import dp
-import requests
+# Відлік часу запуску, включно з імпортом aiogram та модулів бота
+STARTED_AT = time.perf_counter()
 
 from aiogram import Bot, Dispatcher
 from aiogram import F
 from aiogram import types
 from aiogram.types import (
+    BufferedInputFile,
+    FSInputFile,
     Message,
     InlineKeyboardMarkup,
     InlineKeyboardButton,
@@ -21,10 +27,13 @@ from dotenv import load_dotenv
 from database import (
     get_subscribers,
     add_wallet,
+    add_wallets_bulk,
     update_balance,
+    update_balances,
+    update_token_balances,
+    get_state,
+    set_state,
     delete_wallet,
-    get_user_wallets,
-    get_all_wallets,
     is_admin,
     add_admin,
     update_db_schema,
@@ -33,18 +42,89 @@ from database import (
     approve_user,
     remove_subscriber,
     is_user_subscribed,
-    ensure_default_admin, get_wallets,
+    ensure_default_admin,
+    iter_wallets,
+    load_wallet_registry,
+    close_storage,
 )
+from export import export_wallets, xlsx_available
+from health import HealthServer
+from log_setup import setup_logging
+from profiler import LoopLagMonitor, profile
+from throttling import ThrottlingMiddleware, parse_costs, parse_group_limits
+from tron import (
+    DEFAULT_TOKENS,
+    USDT_CONTRACT,
+    decode_account_balances,
+    parse_tokens,
+)
+from tron_pool import EndpointError, EndpointPool
+from wallet_import import parse_wallet_file
+from wallet_registry import registry
 
 load_dotenv()
 TOKEN = os.getenv("BOT_TOKEN")
 TRONSCAN_API_URL = os.getenv("TRONSCAN_API_URL")
+TRACKED_TOKENS = parse_tokens(os.getenv("TRACKED_TOKENS", DEFAULT_TOKENS))
+# Сповіщення та last_balance рахуються за USDT, без нього кожен гаманець мав би баланс 0
+if USDT_CONTRACT not in TRACKED_TOKENS:
+    raise ValueError(f"❌ TRACKED_TOKENS має містити USDT ({USDT_CONTRACT})")
+
+# Пул endpoint'ів: "kind|url|api_key|rps|weight;...", за замовчуванням лише TRONSCAN_API_URL
+TRON_ENDPOINTS = os.getenv("TRON_ENDPOINTS") or (
+    f"tronscan|{TRONSCAN_API_URL}|{os.getenv('TRONSCAN_API_KEY', '')}"
+)
+endpoint_pool = EndpointPool.from_spec(TRON_ENDPOINTS)
+fetch_executor = ThreadPoolExecutor(
+    max_workers=endpoint_pool.concurrency, thread_name_prefix="tron-fetch"
+)
+
+# Спосіб виявлення змін: "poll" - опитування кожного гаманця кожні 5 хвилин,
+# "blocks" - сканування нових блоків та перевірка лише гаманців, що рухались
+DETECTION_ENGINE = os.getenv("DETECTION_ENGINE", "poll")
+
+# Діагностика продуктивності, за замовчуванням вимкнена
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED") == "1"
+LOOP_LAG_THRESHOLD_MS = os.getenv("LOOP_LAG_THRESHOLD_MS")
+MAX_PROFILE_SECONDS = 120
+profile_lock = asyncio.Lock()
+
+# Зупинка бота: фонові задачі завершують поточну пачку і виходять
+shutdown_event = asyncio.Event()
+SHUTDOWN_TIMEOUT = int(os.getenv("SHUTDOWN_TIMEOUT", "30"))
+background_tasks = set()
+
+# Імпортовані гаманці, для яких ще не отримано перший баланс: їхні зміни
+# записуються без сповіщень будь-якою перевіркою, що дійде до них першою
+first_fetch_pending = set()
+
+# Прогрес циклу перевірки зберігається кожні CHECKPOINT_EVERY гаманців
+CHECK_CURSOR_KEY = "check_cursor"
+CHECKPOINT_EVERY = 500
+
+# Порт HTTP-ендпоінта готовності /health (за замовчуванням вимкнений)
+HEALTH_PORT = os.getenv("HEALTH_PORT")
 
-logging.basicConfig(level=logging.INFO)
+# Якщо гаманців більше, звіт надсилається файлом замість повідомлень у чаті
+MAX_WALLETS_IN_CHAT = 30
+
+# Логи пишуться окремим потоком через чергу (LOG_FORMAT=text - звичайний текст)
+setup_logging(os.getenv("LOG_LEVEL", "INFO"), os.getenv("LOG_FORMAT", "json"))
 
 bot = Bot(token=TOKEN)
 dp = Dispatcher()
 
+# Обмеження частоти дорогих команд для кожного користувача (RATE_LIMIT_ENABLED=0 вимикає)
+if os.getenv("RATE_LIMIT_ENABLED", "1") != "0":
+    dp.message.middleware(
+        ThrottlingMiddleware(
+            capacity=int(os.getenv("RATE_LIMIT_CAPACITY", "20")),
+            refill_seconds=float(os.getenv("RATE_LIMIT_REFILL_SECONDS", "3")),
+            costs=parse_costs(os.getenv("RATE_LIMIT_COSTS", "")),
+            group_limits=parse_group_limits(os.getenv("RATE_LIMIT_GROUPS", "")),
+        )
+    )
+
 
 async def get_main_menu(user_id):
     """Формує головне меню відповідно до ролі користувача"""
@@ -133,23 +213,38 @@ async def start_handler(message: Message):
     await message.answer(f"👋 Вітаю! Ви {role}. Виберіть дію:", reply_markup=menu)
 
 
-def get_usdt_balance(wallet_address):
-    """Отримує баланс USDT (TRC20) на гаманці через API Tronscan"""
-    url = f"{TRONSCAN_API_URL}{wallet_address}"
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
+def decode_tracked_balances(kind, raw):
+    return decode_account_balances(raw, TRACKED_TOKENS, kind)
 
-        usdt_balance = 0
-        for token in data.get("trc20token_balances", []):
-            if token["tokenName"] == "Tether USD":
-                usdt_balance = int(token["balance"]) / 1_000_000
 
-        return usdt_balance
-    except requests.RequestException as e:
-        print(f"❌ Помилка отримання балансу USDT: {e}")
-        return 0
+def get_token_balances(wallet_address):
+    """Отримує баланси всіх відстежуваних токенів гаманця одним запитом до Tronscan.
+
+    Відповідь розбирається ще в пулі endpoint'ів, тож обрізана чи некоректна
+    відповідь перемикає на іншого учасника. Повертає {contract: balance} або
+    None, якщо жоден учасник не віддав коректної відповіді.
+    """
+    try:
+        return endpoint_pool.fetch_raw(wallet_address, decode_tracked_balances)[1]
+    except EndpointError as e:
+        logging.warning("❌ Помилка отримання балансів токенів: %s", e)
+        return None
+
+
+async def fetch_balances(addresses):
+    """Паралельно отримує баланси пачки гаманців у потоках fetch_executor.
+
+    Кожна відповідь розбирається в тому ж потоці, що й запит; з orjson розбір
+    швидший за мережу, тож окремий пул процесів не дає виграшу. Для гаманців
+    без коректної відповіді повертається None.
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(
+            loop.run_in_executor(fetch_executor, get_token_balances, address)
+            for address in addresses
+        )
+    )
 
 
 @dp.message(F.text == "💰 Баланс")
@@ -162,12 +257,19 @@ async def balance_handler(message: Message):
     is_admins = await is_admin(user_id)
 
     # Якщо користувач - адмін, отримує всі гаманці
-    wallets = await get_all_wallets() if is_admins else await get_user_wallets(user_id)
+    owner = None if is_admins else user_id
+    wallet_count = registry.count(owner)
 
-    if not wallets:
+    if not wallet_count:
         await message.answer("⚠️ У вас немає збережених гаманців.")
         return
 
+    if wallet_count > MAX_WALLETS_IN_CHAT:
+        await send_wallets_export(message, owner)
+        return
+
+    wallets = registry.all() if is_admins else registry.for_user(user_id)
+
     header = "📊 **Ваші гаманці та їх баланс:**\n" if not is_admins else "📊 **Всі гаманці та їх баланс:**\n"
     messages = [header]
     total_balance = 0
@@ -195,6 +297,39 @@ async def balance_handler(message: Message):
         await message.answer(msg, parse_mode="Markdown")
 
 
+async def send_wallets_export(message: Message, user_id=None, fmt="csv"):
+    """Надсилає звіт про гаманці одним файлом (user_id=None - усі гаманці)"""
+    path = await export_wallets(iter_wallets(user_id), fmt)
+    try:
+        await message.answer_document(
+            FSInputFile(path, filename=f"wallets.{fmt}"),
+            caption="📊 Гаманці та їх баланс",
+        )
+    finally:
+        os.remove(path)
+
+
+@dp.message(Command("export"))
+async def export_handler(message: Message):
+    """Експортує гаманці та баланси у файл CSV (або XLSX: /export xlsx)"""
+    if not await check_access(message):
+        return
+
+    user_id = message.from_user.id
+    is_admins = await is_admin(user_id)
+
+    parts = message.text.split()
+    fmt = parts[1].lower() if len(parts) > 1 else "csv"
+    if fmt not in ("csv", "xlsx"):
+        await message.answer("❌ Формат команди:\n`/export` або `/export xlsx`")
+        return
+    if fmt == "xlsx" and not xlsx_available():
+        await message.answer("⚠️ Експорт у XLSX недоступний, надсилаю CSV.")
+        fmt = "csv"
+
+    await send_wallets_export(message, None if is_admins else user_id, fmt)
+
+
 @dp.message(Command("add_wallet"))
 async def add_wallet_handler(message: Message):
     """Обробляє команду /add_wallet: (Доступ тільки для адмінів)"""
@@ -236,6 +371,66 @@ async def add_wallet_handler(message: Message):
         await message.answer("⚠️ Гаманець з такою адресою вже існує.")
 
 
+@dp.message(Command("import_wallets"))
+async def import_wallets_handler(message: Message):
+    """Пояснює формат файлу для масового імпорту гаманців (Доступ тільки для адмінів)"""
+    if not await is_admin(message.from_user.id):
+        await message.answer("❌ Ви не маєте прав додавати гаманці.")
+        return
+
+    await message.answer(
+        "📥 **Масовий імпорт гаманців**\n\n"
+        "Надішліть файл `.csv` або `.txt`, де кожен рядок має вигляд:\n"
+        "`Назва,Адреса` (CSV) або `Назва Адреса` (TXT).\n"
+        "Рядок лише з адресою теж підходить.",
+        parse_mode="Markdown",
+    )
+
+
+@dp.message(F.document)
+async def import_wallets_file_handler(message: Message):
+    """Масово додає гаманці з надісланого CSV/TXT файлу (Доступ тільки для адмінів)"""
+    user_id = message.from_user.id
+
+    if not await is_admin(user_id):
+        await message.answer("❌ Ви не маєте прав додавати гаманці.")
+        return
+
+    filename = message.document.file_name or ""
+    if not filename.lower().endswith((".csv", ".txt")):
+        await message.answer("⚠️ Підтримуються лише файли `.csv` та `.txt`.")
+        return
+
+    file = await bot.download(message.document)
+    text = file.read().decode("utf-8-sig", errors="replace")
+
+    accepted, rejected = parse_wallet_file(text, filename)
+    added = await add_wallets_bulk(user_id, accepted)
+    existing = len(accepted) - len(added)
+
+    # Перше отримання балансів запускається до звіту, щоб помилка надсилання
+    # звіту не залишила нові гаманці з нульовим балансом у базі
+    if added:
+        new_addresses = [address for _, address in added]
+        first_fetch_pending.update(new_addresses)
+        spawn(check_wallets(new_addresses, notify=False))
+
+    report = (
+        f"📥 **Імпорт завершено**\n"
+        f"✅ Додано: {len(added)}\n"
+        f"♻️ Вже в базі: {existing}\n"
+        f"❌ Відхилено: {len(rejected)}"
+    )
+    for line_number, value, reason in rejected[:20]:
+        # У Markdown-блоці коду зворотну лапку не екранувати, тому її замінено
+        value = value[:40].replace("`", "'")
+        report += f"\n• рядок {line_number}: `{value}` — {reason}"
+    if len(rejected) > 20:
+        report += f"\n… та ще {len(rejected) - 20}"
+
+    await message.answer(report, parse_mode="Markdown")
+
+
 @dp.callback_query(lambda c: c.data == "copy_add_wallet")
 async def copy_add_wallet_callback(callback_query):
     """Надсилає команду /add_wallet користувачу у чат"""
@@ -255,21 +450,13 @@ async def wallets_handler(message: Message):
     user_id = message.from_user.id
     is_admins = await is_admin(user_id)
 
-    wallets = await get_wallets(user_id, is_admins)
+    wallets = registry.all() if is_admins else registry.for_user(user_id)
 
     if not wallets:
         await message.answer("⚠️ У вас немає збережених гаманців.")
         return
 
-    response = "📜 **Список гаманців:**\n"
-
-    for wallet in wallets:
-        if len(wallet) == 3:
-            name, address, last_balance = wallet
-        elif len(wallet) == 2:
-            name, address = wallet
-            last_balance = 0
-
+    for name, address, last_balance in wallets:
         keyboard = InlineKeyboardMarkup(
             inline_keyboard=[
                 [
@@ -325,54 +512,172 @@ async def subscribe_handler(message: Message):
         await message.answer("⚠ Ви вже підписані.")
 
 
-async def check_wallets():
-    """Перевіряє баланси всіх гаманців та надсилає сповіщення підписникам"""
-    wallets = await get_all_wallets()
+async def check_wallets(addresses=None, notify=True, checkpoint=False):
+    """Перевіряє баланси гаманців та надсилає сповіщення підписникам.
+
+    Без addresses перевіряються всі гаманці. З notify=False баланси лише
+    записуються в базу після кожної пачки, без сповіщень (перше отримання
+    балансу для щойно імпортованих гаманців). Так само, без сповіщень,
+    обробляються гаманці з first_fetch_pending, якщо плановий цикл дійшов до
+    них раніше. Старий баланс береться з реєстру в момент обробки, а не зі
+    знімка на початку циклу, тож паралельні перевірки не дублюють сповіщень.
+
+    З checkpoint=True (плановий цикл) гаманці перебираються за адресою, а
+    остання оброблена адреса зберігається в bot_state: перерваний зупинкою
+    цикл після перезапуску продовжується з неї. Під час зупинки повний цикл
+    дообробляє поточну пачку (запити та сповіщення) і завершується.
+    """
+    resume_after = None
+    if addresses is None:
+        wallets = registry.all()
+        if checkpoint:
+            wallets.sort(key=itemgetter(1))
+            resume_after = await get_state(CHECK_CURSOR_KEY)
+            if resume_after:
+                wallets = wallets[
+                    bisect_right(wallets, resume_after, key=itemgetter(1)) :
+                ]
+                logging.info(
+                    "⏩ Продовжуємо перервану перевірку після %s", resume_after
+                )
+    else:
+        wallets = [registry.get(address) for address in addresses]
+        wallets = [wallet for wallet in wallets if wallet is not None]
+
+    logging.info("🔄 Початок перевірки балансів, знайдено %d гаманців", len(wallets))
+
+    started = time.perf_counter()
+    silent_updates = []
+    token_updates = []
+    # Підсумок циклу замість окремого рядка логу на кожен гаманець
+    stats = {
+        "wallets": len(wallets),
+        "changed": 0,
+        "failed": 0,
+        "sent": 0,
+        "send_errors": 0,
+    }
+
+    async def save_progress(cursor):
+        # Курсор зберігається лише після запису балансів усіх гаманців до нього
+        if token_updates:
+            await update_token_balances(token_updates)
+            token_updates.clear()
+        if checkpoint:
+            await set_state(CHECK_CURSOR_KEY, cursor)
+
+    # Запити виконуються паралельно пачками, обробка результатів - по черзі
+    batch_size = endpoint_pool.concurrency * 4
+    unsaved = 0
+    interrupted = False
+
+    for start in range(0, len(wallets), batch_size):
+        if addresses is None and shutdown_event.is_set():
+            interrupted = True
+            break
+        batch = wallets[start : start + batch_size]
+        fetched = await fetch_balances([address for _, address, _ in batch])
+
+        fetched_addresses = []
+        for (name, address, _), balances in zip(batch, fetched):
+            if balances is None:
+                # Баланс невідомий, а не нульовий: без сповіщень і запису в базу
+                stats["failed"] += 1
+                continue
+            last_balance = registry.get_balance(address)
+            if last_balance is None:
+                # Гаманець видалили під час перевірки
+                continue
+            new_balance = balances[USDT_CONTRACT]
+            token_updates.append((address, balances))
+            fetched_addresses.append(address)
+            silent = not notify or address in first_fetch_pending
+            logging.debug(
+                "🔍 Гаманець %s (%s): старий баланс %s USDT, новий баланс %s USDT",
+                name,
+                address,
+                last_balance,
+                new_balance,
+            )
+            if new_balance != last_balance:
+                stats["changed"] += 1
+
+            if new_balance != last_balance and silent:
+                silent_updates.append((address, new_balance))
+            elif new_balance != last_balance:
+                diff_usdt = new_balance - last_balance
+                balance_usdt = new_balance
+
+                if diff_usdt > 0:
+                    message = (
+                        f"📥 **Поповнення USDT!**\n"
+                        f"🔹 **{name}**\n"
+                        f"📍 `{address}`\n"
+                        f"💰 +{diff_usdt:.2f} USDT\n"
+                        f"🏦 Новий баланс: {balance_usdt:.2f} USDT"
+                    )
+                else:
+                    message = (
+                        f"📤 **Зняття коштів!**\n"
+                        f"🔹 **{name}**\n"
+                        f"📍 `{address}`\n"
+                        f"💸 {abs(diff_usdt):.2f} USDT\n"
+                        f"🏦 Новий баланс: {balance_usdt:.2f} USDT"
+                    )
 
-    logging.info(f"🔄 Початок перевірки балансів, знайдено {len(wallets)} гаманців")
+                subscribers = await get_subscribers()
+                logging.debug(
+                    "✉ Надсилаємо сповіщення %d підписникам", len(subscribers)
+                )
 
-    for name, address, last_balance in wallets:
-        new_balance = get_usdt_balance(address)
-        logging.info(
-            f"🔍 Гаманець {name} ({address}): старий баланс {last_balance} USDT, новий баланс {new_balance} USDT"
-        )
+                for user_id in subscribers:
+                    try:
+                        if diff_usdt > 0 or await is_admin(user_id):
+                            await bot.send_message(user_id, message)
+                            stats["sent"] += 1
+                    except Exception as e:
+                        stats["send_errors"] += 1
+                        logging.error(
+                            "⚠️ Помилка надсилання повідомлення користувачу %s: %s",
+                            user_id,
+                            e,
+                        )
 
-        if new_balance != last_balance:
-            diff_usdt = new_balance - last_balance
-            balance_usdt = new_balance
-
-            if diff_usdt > 0:
-                message = (
-                    f"📥 **Поповнення USDT!**\n"
-                    f"🔹 **{name}**\n"
-                    f"📍 `{address}`\n"
-                    f"💰 +{diff_usdt:.2f} USDT\n"
-                    f"🏦 Новий баланс: {balance_usdt:.2f} USDT"
-                )
-            else:
-                message = (
-                    f"📤 **Зняття коштів!**\n"
-                    f"🔹 **{name}**\n"
-                    f"📍 `{address}`\n"
-                    f"💸 {abs(diff_usdt):.2f} USDT\n"
-                    f"🏦 Новий баланс: {balance_usdt:.2f} USDT"
-                )
+                await update_balance(address, new_balance)
 
-            subscribers = await get_subscribers()
-            logging.info(f"✉ Надсилаємо сповіщення {len(subscribers)} підписникам")
-
-            for user_id in subscribers:
-                try:
-                    if diff_usdt > 0 or await is_admin(user_id):
-                        await bot.send_message(user_id, message)
-                        logging.info(f"✅ Повідомлення надіслано користувачу {user_id}")
-                except Exception as e:
-                    logging.error(
-                        f"⚠️ Помилка надсилання повідомлення користувачу {user_id}: {e}"
-                    )
+        if silent_updates:
+            # Тихі оновлення пишуться одразу, щоб інші перевірки порівнювали
+            # з реальним балансом, а не з нулем щойно імпортованого гаманця
+            await update_balances(silent_updates)
+            silent_updates.clear()
+        first_fetch_pending.difference_update(fetched_addresses)
+
+        unsaved += len(batch)
+        if checkpoint and unsaved >= CHECKPOINT_EVERY:
+            await save_progress(batch[-1][1])
+            unsaved = 0
+
+    if interrupted:
+        await save_progress(wallets[start - 1][1] if start else resume_after or "")
+        logging.info(
+            "🛑 Перевірку перервано зупинкою після %d гаманців, прогрес збережено",
+            start,
+        )
+        return
 
-            await update_balance(address, new_balance)
-            logging.info(f"🔄 Оновлено баланс у базі для {name} ({address})")
+    await save_progress("")
+
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    logging.info(
+        "✅ Перевірка балансів завершена: %d гаманців, змінилось %d, без відповіді %d, "
+        "сповіщень %d, за %.1f с",
+        stats["wallets"],
+        stats["changed"],
+        stats["failed"],
+        stats["sent"],
+        stats["seconds"],
+        extra={"cycle": stats},
+    )
 
 
 async def total_balance_handler(message: Message):
@@ -384,7 +689,12 @@ async def total_balance_handler(message: Message):
         await message.answer("❌ У вас немає прав для цієї команди.")
         return
 
-    wallets = await get_all_wallets()
+    if len(registry) > MAX_WALLETS_IN_CHAT:
+        await send_wallets_export(message, None)
+        return
+
+    wallets = registry.all()
+
     total_usdt = 0
     text_parts = []
     current_text = "📊 **Всі гаманці та їх баланси (USDT):**\n"
@@ -443,11 +753,97 @@ async def set_admin_handler(message: Message):
     await message.answer(f"✅ Користувач `{new_admin_id}` тепер є адміністратором!")
 
 
+async def pool_health_checker():
+    """Кожні 30 секунд перевіряє виключені endpoint'и та повертає здорові в пул"""
+    loop = asyncio.get_running_loop()
+    while not await wait_for_shutdown(30):
+        await loop.run_in_executor(fetch_executor, endpoint_pool.check_health)
+
+
+async def load_block_cursor():
+    value = await get_state("block_cursor")
+    return int(value) if value is not None else None
+
+
+async def save_block_cursor(number):
+    await set_state("block_cursor", number)
+
+
+async def check_moved_wallets(addresses):
+    """Оновлює баланси лише тих гаманців, які фігурують у переказах блоку"""
+    await check_wallets(list(addresses))
+
+
+def create_block_scanner():
+    """Створює сканер блоків (TRON_BLOCKS_REPLAY - відтворення блоків з файлу)"""
+    from block_scanner import BlockScanner, NodeBlockSource, ReplayBlockSource
+
+    replay_path = os.getenv("TRON_BLOCKS_REPLAY")
+    start_cursor = None
+    if replay_path:
+        source = ReplayBlockSource(replay_path)
+        start_cursor = min(source.blocks) - 1
+    else:
+        source = NodeBlockSource(
+            os.getenv("TRON_NODE_URL", "https://api.trongrid.io"),
+            os.getenv("TRON_NODE_API_KEY"),
+        )
+
+    return BlockScanner(
+        source,
+        registry,
+        TRACKED_TOKENS,
+        on_moved=check_moved_wallets,
+        load_cursor=load_block_cursor,
+        save_cursor=save_block_cursor,
+        on_gap=check_wallets,
+        start_cursor=start_cursor,
+        stop_event=shutdown_event,
+    )
+
+
 async def scheduled_checker():
     """Перевіряє баланси гаманців та надсилає сповіщення про поповнення кожні 5 хвилин"""
-    while True:
-        await check_wallets()
-        await asyncio.sleep(300)
+    while not shutdown_event.is_set():
+        await check_wallets(checkpoint=True)
+        await wait_for_shutdown(300)
+
+
+async def wait_for_shutdown(seconds):
+    """Чекає seconds секунд; повертає True, якщо за цей час почалась зупинка"""
+    try:
+        await asyncio.wait_for(shutdown_event.wait(), seconds)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def spawn(coro):
+    """Запускає фонову задачу, яку зупинка бота дочекається"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+async def shutdown():
+    """Дочікується фонових задач (не довше SHUTDOWN_TIMEOUT) і звільняє ресурси"""
+    shutdown_event.set()
+    logging.info("🛑 Зупинка: завершуємо поточні перевірки та сповіщення")
+
+    tasks = list(background_tasks)
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=SHUTDOWN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logging.warning(
+                "⚠️ %d задач не завершились вчасно і скасовані", len(pending)
+            )
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    fetch_executor.shutdown(wait=False, cancel_futures=True)
+    await bot.session.close()
 
 
 dp.message(Command("subscribe"))
@@ -547,6 +943,40 @@ async def approve_user_handler(message: Message):
 
 
 
+@dp.message(Command("profile"))
+async def profile_handler(message: Message):
+    """Семплює стеки процесу N секунд і надсилає звіт файлом (Доступ тільки для адмінів)"""
+    if not await is_admin(message.from_user.id):
+        await message.answer("❌ У вас немає прав для цієї команди.")
+        return
+
+    if not PROFILER_ENABLED:
+        await message.answer(
+            "⚠️ Профілювання вимкнено. Увімкніть його змінною `PROFILER_ENABLED=1`."
+        )
+        return
+
+    parts = message.text.split()
+    if len(parts) > 2 or (len(parts) == 2 and not parts[1].isdigit()):
+        await message.answer("❌ Формат команди:\n`/profile секунди`")
+        return
+
+    seconds = min(int(parts[1]) if len(parts) == 2 else 10, MAX_PROFILE_SECONDS)
+
+    if profile_lock.locked():
+        await message.answer("⏳ Профілювання вже виконується.")
+        return
+
+    async with profile_lock:
+        await message.answer(f"⏳ Профілювання {seconds} с...")
+        report = await profile(seconds)
+
+    await message.answer_document(
+        BufferedInputFile(report.encode(), filename="profile.txt"),
+        caption=f"📈 Профіль процесу за {seconds} с",
+    )
+
+
 @dp.message(Command("update_db"))
 async def update_db_handler(message: Message):
     """Оновлює баланс усіх гаманців у базі (ручне оновлення)"""
@@ -665,12 +1095,40 @@ async def delete_wallet_callback(callback_query: types.CallbackQuery):
 
 
 async def main():
-    await update_db_schema()
-    print("✅ База даних оновлена!")
+    health_server = None
+    if HEALTH_PORT:
+        health_server = HealthServer(int(HEALTH_PORT))
+        await health_server.start()
+
+    if await update_db_schema():
+        print("✅ База даних оновлена!")
+    await asyncio.gather(load_wallet_registry(), ensure_default_admin())
+    print(f"✅ Завантажено {len(registry)} гаманців у пам'ять")
+    if LOOP_LAG_THRESHOLD_MS:
+        LoopLagMonitor(threshold=int(LOOP_LAG_THRESHOLD_MS) / 1000).start()
+    if DETECTION_ENGINE == "blocks":
+        spawn(create_block_scanner().run())
+    else:
+        spawn(scheduled_checker())
+    spawn(pool_health_checker())
+
+    startup_ms = (time.perf_counter() - STARTED_AT) * 1000
+    logging.info(
+        "✅ Бот готовий: %d гаманців у пам'яті, запуск за %.0f мс",
+        len(registry),
+        startup_ms,
+    )
+    if health_server:
+        health_server.mark_ready(wallets=len(registry), startup_ms=round(startup_ms))
     print("✅ Бот запущено")
-    await ensure_default_admin()
-    asyncio.create_task(scheduled_checker())
-    await dp.start_polling(bot)
+    try:
+        # aiogram зупиняє polling за SIGTERM/SIGINT; сесію бота закриває shutdown()
+        await dp.start_polling(bot, close_bot_session=False)
+    finally:
+        await shutdown()
+        await close_storage()
+        if health_server:
+            await health_server.stop()
 
 
 if __name__ == "__main__":
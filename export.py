@@ -0,0 +1,64 @@
+import csv
+import importlib.util
+import os
+import tempfile
+
+EXPORT_HEADER = ("Назва", "Адреса", "Баланс USDT")
+
+
+def xlsx_available():
+    # openpyxl імпортується лише під час експорту у XLSX, а не під час запуску бота
+    return importlib.util.find_spec("openpyxl") is not None
+
+
+async def export_wallets(rows, fmt="csv"):
+    """Потоково записує гаманці у тимчасовий файл і повертає шлях до нього.
+
+    rows - асинхронний ітератор (name, address, last_balance), наприклад
+    database.iter_wallets(). Рядки не накопичуються в пам'яті: CSV пишеться
+    через буферизований файл, XLSX - у режимі write_only. Останній рядок
+    файлу містить загальний баланс. Файл видаляє викликач.
+    """
+    if fmt == "xlsx" and not xlsx_available():
+        raise RuntimeError("Для експорту у XLSX встановіть пакет openpyxl")
+
+    fd, path = tempfile.mkstemp(prefix="wallets_", suffix=f".{fmt}")
+    total_balance = 0
+    count = 0
+
+    try:
+        if fmt == "xlsx":
+            from openpyxl import Workbook
+
+            os.close(fd)
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("Гаманці")
+            sheet.append(EXPORT_HEADER)
+            async for name, address, last_balance in rows:
+                last_balance = last_balance or 0
+                total_balance += last_balance
+                count += 1
+                sheet.append((name, address, round(last_balance, 2)))
+            sheet.append(
+                ("Загальний баланс", f"{count} гаманців", round(total_balance, 2))
+            )
+            workbook.save(path)
+        else:
+            with open(
+                fd, "w", newline="", encoding="utf-8-sig", buffering=65536
+            ) as file:
+                writer = csv.writer(file)
+                writer.writerow(EXPORT_HEADER)
+                async for name, address, last_balance in rows:
+                    last_balance = last_balance or 0
+                    total_balance += last_balance
+                    count += 1
+                    writer.writerow((name, address, f"{last_balance:.2f}"))
+                writer.writerow(
+                    ("Загальний баланс", f"{count} гаманців", f"{total_balance:.2f}")
+                )
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return path
@@ -0,0 +1,47 @@
+import json
+import logging
+
+
+class HealthServer:
+    """HTTP-ендпоінт готовності для оркестратора (systemd, Docker, Kubernetes).
+
+    GET /health повертає 503 під час запуску і 200 після mark_ready(), тобто
+    лише коли реєстр гаманців завантажено і бот може обробляти запити.
+    aiohttp (залежність aiogram) імпортується лише якщо сервер увімкнено.
+    """
+
+    def __init__(self, port, host="0.0.0.0"):
+        self.port = port
+        self.host = host
+        self.ready = False
+        self.details = {}
+        self._runner = None
+
+    def mark_ready(self, **details):
+        self.ready = True
+        self.details = details
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        body = {"status": "ready" if self.ready else "starting", **self.details}
+        return web.Response(
+            text=json.dumps(body),
+            status=200 if self.ready else 503,
+            content_type="application/json",
+        )
+
+    async def start(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/health", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logging.info("🩺 Health endpoint: http://%s:%s/health", self.host, self.port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,130 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Атрибути, які є в кожному LogRecord; решта - поля з extra={...}
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Один JSON-об'єкт на рядок: час, рівень, логер, повідомлення та поля extra"""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Пропускає не більше burst однакових записів за period секунд.
+
+    Записи вважаються однаковими за шаблоном повідомлення (record.msg), тому
+    повідомлення з %-аргументами про різні гаманці чи endpoint'и обмежуються
+    разом. Перший запис після паузи отримує поле suppressed - скільки записів
+    було відкинуто у попередньому вікні. DEBUG не обмежується: його вмикають
+    свідомо, щоб бачити кожен гаманець.
+    """
+
+    def __init__(self, burst=20, period=60.0, max_keys=1000):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.max_keys = max_keys
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.INFO:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                if window is not None and window[1] > self.burst:
+                    record.suppressed = window[1] - self.burst
+                if window is None and len(self._windows) >= self.max_keys:
+                    self._prune(now)
+                self._windows[key] = [now, 1]
+                return True
+            window[1] += 1
+            return window[1] <= self.burst
+
+    def _prune(self, now):
+        # f-string повідомлення дають унікальні шаблони; старі вікна не потрібні
+        self._windows = {
+            key: window
+            for key, window in self._windows.items()
+            if now - window[0] < self.period
+        }
+
+
+class AsyncQueueHandler(QueueHandler):
+    """Кладе запис у чергу без форматування; форматує і пише потік QueueListener.
+
+    Стандартний QueueHandler форматує повідомлення ще в потоці, що логує
+    (тобто в event loop). Тут запис передається як є, тож у loop лишається
+    лише створення LogRecord і put у чергу. Якщо черга переповнена (вивід
+    не встигає), запис відкидається і враховується в dropped.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level="INFO", fmt="json", stream=None, max_queue=10_000):
+    """Налаштовує кореневий логер на асинхронний запис через чергу.
+
+    Повертає запущений QueueListener; stop_logging(listener) дописує чергу.
+    """
+    if fmt == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=max_queue)
+    handler = AsyncQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    for old_handler in root.handlers[:]:
+        root.removeHandler(old_handler)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+
+def stop_logging(listener):
+    """Дописує записи з черги і зупиняє потік логера (повторний виклик безпечний)"""
+    if listener._thread is not None:
+        listener.stop()
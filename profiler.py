@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    filename = code.co_filename.rsplit("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def _collapse(frame, thread_name):
+    """Стек потоку у форматі "потік;зовнішня функція;...;внутрішня функція" """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def sample_stacks(seconds, interval=0.005):
+    """Семплює стеки всіх потоків процесу протягом seconds секунд.
+
+    Повертає Counter {collapsed-стек: кількість семплів}. Працює у потоці, з
+    якого викликана (запускайте поза event loop).
+    """
+    own_id = threading.get_ident()
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id != own_id:
+                stacks[_collapse(frame, names.get(thread_id, str(thread_id)))] += 1
+        time.sleep(interval)
+
+    return stacks
+
+
+def format_profile(stacks, seconds, interval):
+    """Звіт профілювання: зведення найчастіших стеків і collapsed-стеки для flamegraph"""
+    total = sum(stacks.values()) or 1
+    lines = [
+        f"# Профіль за {seconds} с, інтервал {interval * 1000:.0f} мс, "
+        f"семплів {total}",
+        "# Формат: collapsed stacks (flamegraph.pl, speedscope), "
+        "найчастіші стеки першими",
+    ]
+    for stack, count in stacks.most_common():
+        lines.append(f"{stack} {count}")
+    return "\n".join(lines) + "\n"
+
+
+async def profile(seconds, interval=0.005):
+    """Профілює процес у окремому потоці, не блокуючи event loop"""
+    stacks = await asyncio.to_thread(sample_stacks, seconds, interval)
+    return format_profile(stacks, seconds, interval)
+
+
+class LoopLagMonitor:
+    """Стежить за затримкою event loop і логує стек виклику, що його заблокував.
+
+    Задача в loop оновлює heartbeat кожні interval секунд. Сторожовий потік
+    помічає, що heartbeat не оновлювався довше threshold, і записує в лог
+    поточний стек потоку loop - тобто саме блокуючий виклик.
+    """
+
+    def __init__(self, threshold=0.1, interval=0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.heartbeat = time.monotonic()
+        self.max_lag = 0.0
+        self._loop_thread_id = None
+        self._task = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._task = asyncio.create_task(self._tick())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            self.heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - started - self.interval
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                logging.warning("🐢 Event loop заблоковано на %.0f мс", lag * 1000)
+
+    def _watch(self):
+        reported = None
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self.heartbeat
+            stalled = time.monotonic() - heartbeat
+            if stalled <= self.threshold + self.interval or reported == heartbeat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported = heartbeat
+            stack = "".join(traceback.format_stack(frame))
+            logging.warning(
+                "🐢 Event loop не відповідає %.0f мс, блокуючий виклик:\n%s",
+                stalled * 1000,
+                stack,
+            )
@@ -0,0 +1,150 @@
+from abc import ABC, abstractmethod
+
+
+class Storage(ABC):
+    """Інтерфейс сховища даних бота.
+
+    Реалізації: SqliteStorage (storage_sqlite.py) та PostgresStorage
+    (storage_postgres.py). Модуль database.py обирає одну з них за змінною
+    DATABASE_URL і надає зверху звичні функції (add_wallet, is_admin, ...).
+    Рядки гаманців повертаються кортежами, як з курсора SQLite.
+    """
+
+    async def close(self):
+        """Закриває з'єднання зі сховищем"""
+
+    @abstractmethod
+    async def init_db(self):
+        ...
+
+    @abstractmethod
+    async def update_db_schema(self):
+        """Повертає True, якщо схема оновлювалась, False - якщо вже актуальна"""
+
+    # Гаманці
+
+    @abstractmethod
+    async def add_wallet(self, user_id, name, address):
+        """Повертає False, якщо адреса вже існує"""
+
+    @abstractmethod
+    async def add_wallets_bulk(self, user_id, wallets):
+        """Додає [(name, address), ...] і повертає лише нові гаманці"""
+
+    @abstractmethod
+    async def delete_wallet(self, user_id, address):
+        ...
+
+    @abstractmethod
+    async def get_user_wallets(self, user_id):
+        ...
+
+    @abstractmethod
+    async def get_all_wallets(self):
+        ...
+
+    @abstractmethod
+    async def get_wallets(self, user_id, is_admin):
+        ...
+
+    @abstractmethod
+    def iter_wallets(self, user_id=None):
+        """Асинхронний ітератор (name, address, last_balance) з курсора"""
+
+    @abstractmethod
+    async def load_wallet_rows(self):
+        """Усі гаманці як (user_id, name, address, last_balance)"""
+
+    @abstractmethod
+    async def update_balance(self, address, new_balance):
+        ...
+
+    @abstractmethod
+    async def update_balances(self, balances):
+        """Пакетне оновлення [(address, new_balance), ...]"""
+
+    @abstractmethod
+    async def update_token_balances(self, wallet_balances):
+        """Пакетне збереження [(address, {contract: balance}), ...]"""
+
+    @abstractmethod
+    async def get_token_balances(self, address):
+        ...
+
+    # Користувачі
+
+    @abstractmethod
+    async def add_user(self, user_id, username):
+        ...
+
+    @abstractmethod
+    async def remove_user(self, user_id):
+        ...
+
+    @abstractmethod
+    async def is_user_exists(self, user_id):
+        ...
+
+    @abstractmethod
+    async def is_user_approved(self, user_id):
+        ...
+
+    @abstractmethod
+    async def approve_user(self, user_id):
+        ...
+
+    @abstractmethod
+    async def get_pending_users(self):
+        ...
+
+    @abstractmethod
+    async def is_admin(self, user_id):
+        ...
+
+    @abstractmethod
+    async def add_admin(self, user_id, username=None):
+        ...
+
+    @abstractmethod
+    async def ensure_default_admin(self, admin_id):
+        ...
+
+    @abstractmethod
+    async def add_subscriber(self, user_id):
+        ...
+
+    @abstractmethod
+    async def remove_subscriber(self, user_id):
+        ...
+
+    @abstractmethod
+    async def is_user_subscribed(self, user_id):
+        ...
+
+    @abstractmethod
+    async def get_subscribers(self):
+        ...
+
+    # Службовий стан
+
+    @abstractmethod
+    async def get_state(self, key, default=None):
+        ...
+
+    @abstractmethod
+    async def set_state(self, key, value):
+        ...
+
+
+def create_storage(database_url=None, db_name=None):
+    """Створює сховище за DATABASE_URL (postgresql://...) або файлом SQLite DB_NAME"""
+    if database_url and database_url.startswith(("postgres://", "postgresql://")):
+        from storage_postgres import PostgresStorage
+
+        return PostgresStorage(database_url)
+
+    from storage_sqlite import SqliteStorage
+
+    if database_url and database_url.startswith("sqlite:///"):
+        db_name = database_url[len("sqlite:///") :]
+    return SqliteStorage(db_name)
@@ -0,0 +1,339 @@
+from storage import Storage
+
+try:
+    import asyncpg
+except ImportError:  # asyncpg потрібен лише для DATABASE_URL=postgresql://...
+    asyncpg = None
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id BIGINT PRIMARY KEY,
+        username TEXT,
+        is_approved INTEGER DEFAULT 0,
+        is_admin INTEGER DEFAULT 0,
+        is_subscribed INTEGER DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS wallets (
+        id BIGSERIAL PRIMARY KEY,
+        user_id BIGINT,
+        name TEXT,
+        address TEXT UNIQUE,
+        balance DOUBLE PRECISION DEFAULT 0,
+        last_balance DOUBLE PRECISION DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS wallets_user_id_idx ON wallets (user_id)",
+    """
+    CREATE TABLE IF NOT EXISTS token_balances (
+        address TEXT,
+        token TEXT,
+        balance DOUBLE PRECISION DEFAULT 0,
+        PRIMARY KEY (address, token)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bot_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+]
+
+# Збільшуйте при кожній зміні SCHEMA або MIGRATIONS
+SCHEMA_VERSION = 1
+
+# Колонки, які в SQLite додавалися окремими міграціями
+MIGRATIONS = [
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS is_subscribed INTEGER DEFAULT 0",
+    "ALTER TABLE wallets ADD COLUMN IF NOT EXISTS last_balance DOUBLE PRECISION DEFAULT 0",
+]
+
+
+class PostgresStorage(Storage):
+    """Сховище у PostgreSQL з пулом з'єднань asyncpg.
+
+    Пул створюється при першому запиті. Масові вставки йдуть через COPY у
+    тимчасову таблицю. Записи не блокують усю базу, як у SQLite, але бот
+    розрахований на один процес: реєстр гаманців у пам'яті (database.py)
+    не бачить змін, зроблених іншими процесами.
+    """
+
+    def __init__(self, dsn, min_size=1, max_size=10):
+        if asyncpg is None:
+            raise RuntimeError("Для PostgreSQL встановіть пакет asyncpg")
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+
+    async def pool(self):
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(
+                self.dsn, min_size=self.min_size, max_size=self.max_size
+            )
+        return self._pool
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def _execute(self, query, *args):
+        return await (await self.pool()).execute(query, *args)
+
+    async def _fetch(self, query, *args):
+        return [tuple(row) for row in await (await self.pool()).fetch(query, *args)]
+
+    async def _fetchval(self, query, *args):
+        return await (await self.pool()).fetchval(query, *args)
+
+    async def init_db(self):
+        async with (await self.pool()).acquire() as conn:
+            async with conn.transaction():
+                for statement in SCHEMA:
+                    await conn.execute(statement)
+
+    async def update_db_schema(self):
+        """Застосовує міграції, якщо версія схеми в bot_state застаріла"""
+        async with (await self.pool()).acquire() as conn:
+            try:
+                version = await conn.fetchval(
+                    "SELECT value FROM bot_state WHERE key = 'schema_version'"
+                )
+            except asyncpg.UndefinedTableError:
+                version = None
+            if version is not None and int(version) >= SCHEMA_VERSION:
+                return False
+
+            async with conn.transaction():
+                for statement in SCHEMA + MIGRATIONS:
+                    await conn.execute(statement)
+                await conn.execute(
+                    "INSERT INTO bot_state (key, value) VALUES ('schema_version', $1) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    str(SCHEMA_VERSION),
+                )
+        return True
+
+    async def add_wallet(self, user_id, name, address):
+        inserted = await self._fetchval(
+            "INSERT INTO wallets (user_id, name, address) VALUES ($1, $2, $3) "
+            "ON CONFLICT (address) DO NOTHING RETURNING id",
+            user_id,
+            name,
+            address,
+        )
+        return inserted is not None
+
+    async def add_wallets_bulk(self, user_id, wallets):
+        async with (await self.pool()).acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    "CREATE TEMP TABLE wallets_import "
+                    "(user_id BIGINT, name TEXT, address TEXT) ON COMMIT DROP"
+                )
+                await conn.copy_records_to_table(
+                    "wallets_import",
+                    records=[(user_id, name, address) for name, address in wallets],
+                    columns=("user_id", "name", "address"),
+                )
+                rows = await conn.fetch(
+                    "INSERT INTO wallets (user_id, name, address) "
+                    "SELECT user_id, name, address FROM wallets_import "
+                    "ON CONFLICT (address) DO NOTHING RETURNING name, address"
+                )
+        return [tuple(row) for row in rows]
+
+    async def delete_wallet(self, user_id, address):
+        async with (await self.pool()).acquire() as conn:
+            async with conn.transaction():
+                status = await conn.execute(
+                    "DELETE FROM wallets WHERE user_id = $1 AND address = $2",
+                    user_id,
+                    address,
+                )
+                deleted = status != "DELETE 0"
+                if deleted:
+                    await conn.execute(
+                        "DELETE FROM token_balances WHERE address = $1", address
+                    )
+        return deleted
+
+    async def get_user_wallets(self, user_id):
+        return await self._fetch(
+            "SELECT name, address, last_balance FROM wallets WHERE user_id = $1",
+            user_id,
+        )
+
+    async def get_all_wallets(self):
+        return await self._fetch("SELECT name, address, last_balance FROM wallets")
+
+    async def get_wallets(self, user_id, is_admin):
+        if is_admin:
+            return await self._fetch("SELECT name, address FROM wallets")
+        return await self._fetch(
+            "SELECT name, address FROM wallets WHERE user_id = $1", user_id
+        )
+
+    async def iter_wallets(self, user_id=None):
+        if user_id is None:
+            query = "SELECT name, address, last_balance FROM wallets ORDER BY id"
+            args = ()
+        else:
+            query = (
+                "SELECT name, address, last_balance FROM wallets "
+                "WHERE user_id = $1 ORDER BY id"
+            )
+            args = (user_id,)
+
+        async with (await self.pool()).acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(query, *args, prefetch=500):
+                    yield tuple(row)
+
+    async def load_wallet_rows(self):
+        return await self._fetch(
+            "SELECT user_id, name, address, last_balance FROM wallets"
+        )
+
+    async def update_balance(self, address, new_balance):
+        await self._execute(
+            "UPDATE wallets SET last_balance = $1 WHERE address = $2",
+            new_balance,
+            address,
+        )
+
+    async def update_balances(self, balances):
+        async with (await self.pool()).acquire() as conn:
+            await conn.executemany(
+                "UPDATE wallets SET last_balance = $1 WHERE address = $2",
+                [(new_balance, address) for address, new_balance in balances],
+            )
+
+    async def update_token_balances(self, wallet_balances):
+        # Як і в SQLite, при повторі (address, token) перемагає останнє значення
+        latest = {
+            (address, contract): balance
+            for address, balances in wallet_balances
+            for contract, balance in balances.items()
+        }
+        records = [
+            (address, contract, balance)
+            for (address, contract), balance in latest.items()
+        ]
+        async with (await self.pool()).acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    "CREATE TEMP TABLE token_balances_import "
+                    "(address TEXT, token TEXT, balance DOUBLE PRECISION) ON COMMIT DROP"
+                )
+                await conn.copy_records_to_table(
+                    "token_balances_import", records=records
+                )
+                await conn.execute(
+                    "INSERT INTO token_balances (address, token, balance) "
+                    "SELECT address, token, balance FROM token_balances_import "
+                    "ON CONFLICT (address, token) DO UPDATE SET balance = excluded.balance"
+                )
+
+    async def get_token_balances(self, address):
+        return dict(
+            await self._fetch(
+                "SELECT token, balance FROM token_balances WHERE address = $1", address
+            )
+        )
+
+    async def add_user(self, user_id, username):
+        await self._execute(
+            "INSERT INTO users (user_id, username, is_approved) VALUES ($1, $2, 0) "
+            "ON CONFLICT (user_id) DO NOTHING",
+            user_id,
+            username,
+        )
+
+    async def remove_user(self, user_id):
+        await self._execute("DELETE FROM users WHERE user_id = $1", user_id)
+
+    async def is_user_exists(self, user_id):
+        count = await self._fetchval(
+            "SELECT COUNT(*) FROM users WHERE user_id = $1", user_id
+        )
+        return count > 0
+
+    async def is_user_approved(self, user_id):
+        value = await self._fetchval(
+            "SELECT is_approved FROM users WHERE user_id = $1", user_id
+        )
+        return value == 1
+
+    async def approve_user(self, user_id):
+        await self._execute(
+            "UPDATE users SET is_approved = 1 WHERE user_id = $1", user_id
+        )
+
+    async def get_pending_users(self):
+        return await self._fetch(
+            "SELECT user_id, username FROM users WHERE is_approved = 0"
+        )
+
+    async def is_admin(self, user_id):
+        value = await self._fetchval(
+            "SELECT is_admin FROM users WHERE user_id = $1", user_id
+        )
+        return value == 1
+
+    async def add_admin(self, user_id, username=None):
+        if username:
+            await self._execute(
+                "INSERT INTO users (user_id, username, is_admin) VALUES ($1, $2, 1) "
+                "ON CONFLICT (user_id) DO UPDATE SET is_admin = 1, "
+                "username = COALESCE(users.username, $2)",
+                user_id,
+                username,
+            )
+        else:
+            await self._execute(
+                "UPDATE users SET is_admin = 1 WHERE user_id = $1", user_id
+            )
+
+    async def ensure_default_admin(self, admin_id):
+        await self._execute(
+            "INSERT INTO users (user_id, is_admin) VALUES ($1, 1) "
+            "ON CONFLICT (user_id) DO UPDATE SET is_admin = 1",
+            admin_id,
+        )
+
+    async def add_subscriber(self, user_id):
+        await self._execute(
+            "UPDATE users SET is_subscribed = 1 WHERE user_id = $1", user_id
+        )
+
+    async def remove_subscriber(self, user_id):
+        await self._execute(
+            "UPDATE users SET is_subscribed = 0 WHERE user_id = $1", user_id
+        )
+
+    async def is_user_subscribed(self, user_id):
+        value = await self._fetchval(
+            "SELECT is_subscribed FROM users WHERE user_id = $1", user_id
+        )
+        return value == 1
+
+    async def get_subscribers(self):
+        rows = await self._fetch("SELECT user_id FROM users WHERE is_subscribed = 1")
+        return [row[0] for row in rows]
+
+    async def get_state(self, key, default=None):
+        value = await self._fetchval("SELECT value FROM bot_state WHERE key = $1", key)
+        return default if value is None else value
+
+    async def set_state(self, key, value):
+        await self._execute(
+            "INSERT INTO bot_state (key, value) VALUES ($1, $2) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            key,
+            str(value),
+        )
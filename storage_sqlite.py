@@ -0,0 +1,359 @@
+import aiosqlite
+
+from storage import Storage
+
+TOKEN_BALANCES_TABLE = """
+    CREATE TABLE IF NOT EXISTS token_balances (
+        address TEXT,
+        token TEXT,
+        balance REAL DEFAULT 0,
+        PRIMARY KEY (address, token)
+    )
+"""
+
+# Збільшуйте при кожній новій міграції в update_db_schema
+SCHEMA_VERSION = 1
+
+BOT_STATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS bot_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+"""
+
+
+class SqliteStorage(Storage):
+    """Сховище у файлі SQLite (aiosqlite, окреме з'єднання на кожну операцію)"""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+
+    def connect(self):
+        return aiosqlite.connect(self.db_name)
+
+    async def init_db(self):
+        async with self.connect() as db:
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT,
+                    is_approved INTEGER DEFAULT 0
+                )
+            """
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS wallets (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    name TEXT,
+                    address TEXT UNIQUE,
+                    balance REAL DEFAULT 0,
+                    FOREIGN KEY (user_id) REFERENCES users(id)
+                )
+            """
+            )
+            await db.execute(TOKEN_BALANCES_TABLE)
+            await db.execute(BOT_STATE_TABLE)
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS subscribers (
+                    user_id INTEGER PRIMARY KEY,
+                    FOREIGN KEY (user_id) REFERENCES users(id)
+                )
+            """
+            )
+            await db.commit()
+
+    async def update_db_schema(self):
+        """Застосовує міграції, якщо версія схеми (PRAGMA user_version) застаріла.
+
+        Повертає True, якщо схема оновлювалась.
+        """
+        async with self.connect() as db:
+            cursor = await db.execute("PRAGMA user_version")
+            (version,) = await cursor.fetchone()
+            if version >= SCHEMA_VERSION:
+                return False
+
+            await db.execute(TOKEN_BALANCES_TABLE)
+            await db.execute(BOT_STATE_TABLE)
+
+            cursor = await db.execute("PRAGMA table_info(users)")
+            columns = [row[1] for row in await cursor.fetchall()]
+
+            if "is_subscribed" not in columns:
+                await db.execute(
+                    "ALTER TABLE users ADD COLUMN is_subscribed INTEGER DEFAULT 0"
+                )
+                print("✅ Колонка is_subscribed успішно додана!")
+            else:
+                print("⚠️ Колонка is_subscribed вже існує.")
+
+            cursor = await db.execute("PRAGMA table_info(wallets)")
+            columns = [row[1] for row in await cursor.fetchall()]
+
+            if "last_balance" not in columns:
+                await db.execute(
+                    "ALTER TABLE wallets ADD COLUMN last_balance REAL DEFAULT 0"
+                )
+                print("✅ Колонка last_balance успішно додана!")
+
+            await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            await db.commit()
+            return True
+
+    async def add_wallet(self, user_id, name, address):
+        async with self.connect() as db:
+            try:
+                await db.execute(
+                    "INSERT INTO wallets (user_id, name, address) VALUES (?, ?, ?)",
+                    (user_id, name, address),
+                )
+                await db.commit()
+                return True
+            except aiosqlite.IntegrityError:
+                return False
+
+    async def add_wallets_bulk(self, user_id, wallets):
+        async with self.connect() as db:
+            existing = set()
+            addresses = [address for _, address in wallets]
+            for start in range(0, len(addresses), 500):
+                chunk = addresses[start : start + 500]
+                cursor = await db.execute(
+                    "SELECT address FROM wallets WHERE address IN (%s)"
+                    % ",".join("?" * len(chunk)),
+                    chunk,
+                )
+                existing.update(row[0] for row in await cursor.fetchall())
+
+            new_wallets = [
+                (name, address) for name, address in wallets if address not in existing
+            ]
+            await db.executemany(
+                "INSERT OR IGNORE INTO wallets (user_id, name, address) VALUES (?, ?, ?)",
+                [(user_id, name, address) for name, address in new_wallets],
+            )
+            await db.commit()
+        return new_wallets
+
+    async def delete_wallet(self, user_id, address):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "DELETE FROM wallets WHERE user_id = ? AND address = ?",
+                (user_id, address),
+            )
+            rows_deleted = cursor.rowcount
+            if rows_deleted > 0:
+                await db.execute(
+                    "DELETE FROM token_balances WHERE address = ?", (address,)
+                )
+            await db.commit()
+            return rows_deleted > 0
+
+    async def get_user_wallets(self, user_id):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT name, address, last_balance FROM wallets WHERE user_id = ?",
+                (user_id,),
+            )
+            return await cursor.fetchall()
+
+    async def get_all_wallets(self):
+        async with self.connect() as db:
+            cursor = await db.execute("SELECT name, address, last_balance FROM wallets")
+            return await cursor.fetchall()
+
+    async def get_wallets(self, user_id, is_admin):
+        async with self.connect() as db:
+            if is_admin:
+                query = "SELECT name, address FROM wallets;"
+                params = ()
+            else:
+                query = "SELECT name, address FROM wallets WHERE user_id = ?;"
+                params = (user_id,)
+
+            async with db.execute(query, params) as cursor:
+                return await cursor.fetchall()
+
+    async def iter_wallets(self, user_id=None):
+        if user_id is None:
+            query = "SELECT name, address, last_balance FROM wallets ORDER BY id"
+            params = ()
+        else:
+            query = (
+                "SELECT name, address, last_balance FROM wallets "
+                "WHERE user_id = ? ORDER BY id"
+            )
+            params = (user_id,)
+
+        async with self.connect() as db:
+            async with db.execute(query, params) as cursor:
+                async for row in cursor:
+                    yield row
+
+    async def load_wallet_rows(self):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT user_id, name, address, last_balance FROM wallets"
+            )
+            return await cursor.fetchall()
+
+    async def update_balance(self, address, new_balance):
+        async with self.connect() as db:
+            await db.execute(
+                "UPDATE wallets SET last_balance = ? WHERE address = ?",
+                (new_balance, address),
+            )
+            await db.commit()
+
+    async def update_balances(self, balances):
+        async with self.connect() as db:
+            await db.executemany(
+                "UPDATE wallets SET last_balance = ? WHERE address = ?",
+                [(new_balance, address) for address, new_balance in balances],
+            )
+            await db.commit()
+
+    async def update_token_balances(self, wallet_balances):
+        rows = [
+            (address, contract, balance)
+            for address, balances in wallet_balances
+            for contract, balance in balances.items()
+        ]
+        async with self.connect() as db:
+            await db.executemany(
+                "INSERT INTO token_balances (address, token, balance) VALUES (?, ?, ?) "
+                "ON CONFLICT(address, token) DO UPDATE SET balance = excluded.balance",
+                rows,
+            )
+            await db.commit()
+
+    async def get_token_balances(self, address):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT token, balance FROM token_balances WHERE address = ?",
+                (address,),
+            )
+            return dict(await cursor.fetchall())
+
+    async def add_user(self, user_id, username):
+        async with self.connect() as db:
+            await db.execute(
+                "INSERT OR IGNORE INTO users (user_id, username, is_approved) VALUES (?, ?, 0)",
+                (user_id, username),
+            )
+            await db.commit()
+
+    async def remove_user(self, user_id):
+        async with self.connect() as db:
+            await db.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+            await db.commit()
+
+    async def is_user_exists(self, user_id):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT COUNT(*) FROM users WHERE user_id = ?", (user_id,)
+            )
+            result = await cursor.fetchone()
+            return result[0] > 0
+
+    async def is_user_approved(self, user_id):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT is_approved FROM users WHERE user_id = ?", (user_id,)
+            )
+            row = await cursor.fetchone()
+            return row and row[0] == 1
+
+    async def approve_user(self, user_id):
+        async with self.connect() as db:
+            await db.execute(
+                "UPDATE users SET is_approved = 1 WHERE user_id = ?", (user_id,)
+            )
+            await db.commit()
+
+    async def get_pending_users(self):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT user_id, username FROM users WHERE is_approved = 0"
+            )
+            return await cursor.fetchall()
+
+    async def is_admin(self, user_id):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT is_admin FROM users WHERE user_id = ?", (user_id,)
+            )
+            result = await cursor.fetchone()
+            return result and result[0] == 1
+
+    async def add_admin(self, user_id, username=None):
+        async with self.connect() as db:
+            if username:
+                await db.execute(
+                    "INSERT INTO users (user_id, username, is_admin) VALUES (?, ?, 1) ON CONFLICT(user_id) DO UPDATE SET is_admin = 1, username = COALESCE(username, ?)",
+                    (user_id, username, username),
+                )
+            else:
+                await db.execute(
+                    "UPDATE users SET is_admin = 1 WHERE user_id = ?", (user_id,)
+                )
+            await db.commit()
+
+    async def ensure_default_admin(self, admin_id):
+        async with self.connect() as db:
+            await db.execute(
+                "INSERT INTO users (user_id, is_admin) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET is_admin = 1;",
+                (admin_id, 1),
+            )
+            await db.commit()
+
+    async def add_subscriber(self, user_id):
+        async with self.connect() as db:
+            await db.execute(
+                "UPDATE users SET is_subscribed = 1 WHERE user_id = ?", (user_id,)
+            )
+            await db.commit()
+
+    async def remove_subscriber(self, user_id):
+        async with self.connect() as db:
+            await db.execute(
+                "UPDATE users SET is_subscribed = 0 WHERE user_id = ?", (user_id,)
+            )
+            await db.commit()
+
+    async def is_user_subscribed(self, user_id):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT is_subscribed FROM users WHERE user_id = ?", (user_id,)
+            )
+            row = await cursor.fetchone()
+            return row and row[0] == 1
+
+    async def get_subscribers(self):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT user_id FROM users WHERE is_subscribed = 1"
+            )
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def get_state(self, key, default=None):
+        async with self.connect() as db:
+            cursor = await db.execute(
+                "SELECT value FROM bot_state WHERE key = ?", (key,)
+            )
+            row = await cursor.fetchone()
+            return row[0] if row else default
+
+    async def set_state(self, key, value):
+        async with self.connect() as db:
+            await db.execute(
+                "INSERT INTO bot_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value)),
+            )
+            await db.commit()
@@ -0,0 +1,166 @@
+import math
+import time
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+from cachetools import LRUCache
+
+# Група команди: тексти кнопок та команди, що виконують одну й ту саму роботу
+COMMAND_GROUPS = {
+    "/update_db": "update_db",
+    "🔄 Оновити базу": "update_db",
+    "💰 Баланс": "balance",
+    "📊 Загальний баланс": "balance",
+    "/export": "balance",
+    "/wallets": "wallets",
+    "📋 Мої гаманці": "wallets",
+    "/profile": "profile",
+}
+
+# Вартість команди у токенах загального бюджету користувача (за замовчуванням 1)
+DEFAULT_COSTS = {
+    "update_db": 10,
+    "balance": 3,
+    "wallets": 2,
+    "profile": 5,
+}
+
+# Окремі ліміти груп: (ємність, секунд на відновлення одного токена)
+DEFAULT_GROUP_LIMITS = {
+    "update_db": (1, 120),
+    "balance": (3, 10),
+    "profile": (1, 60),
+}
+
+
+def parse_costs(spec):
+    """Розбирає "група=вартість,..." поверх DEFAULT_COSTS"""
+    costs = dict(DEFAULT_COSTS)
+    for item in spec.split(","):
+        if item.strip():
+            group, cost = item.split("=")
+            costs[group.strip()] = int(cost)
+    return costs
+
+
+def parse_group_limits(spec):
+    """Розбирає "група=ємність/секунди,..." поверх DEFAULT_GROUP_LIMITS.
+
+    Ємність 0 знімає окремий ліміт групи.
+    """
+    limits = dict(DEFAULT_GROUP_LIMITS)
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        group, limit = item.split("=")
+        capacity, seconds = limit.split("/")
+        if int(capacity):
+            limits[group.strip()] = (int(capacity), float(seconds))
+        else:
+            limits.pop(group.strip(), None)
+    return limits
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "refill_rate", "tokens", "updated")
+
+    def __init__(self, capacity, refill_rate, now):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.refill_rate
+        )
+        self.updated = now
+
+    def wait_time(self, cost):
+        """Скільки секунд чекати, доки в бакеті буде cost токенів"""
+        missing = min(cost, self.capacity) - self.tokens
+        return max(0.0, missing / self.refill_rate)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Обмежує частоту дорогих команд для кожного користувача.
+
+    Кожен користувач має загальний бакет токенів, з якого команда списує свою
+    вартість, а група команди - ще й окремий бакет. Якщо токенів не вистачає,
+    обробник не викликається, а користувач один раз отримує відповідь, через
+    скільки секунд можна спробувати знову; решта повідомлень до кінця цього
+    очікування відкидаються мовчки, щоб флуд не перетворювався на запити до
+    Bot API. Бакети зберігаються в LRU-кеші, тож пам'ять обмежена max_buckets
+    незалежно від кількості користувачів.
+    """
+
+    def __init__(
+        self,
+        capacity=20,
+        refill_seconds=3,
+        costs=None,
+        group_limits=None,
+        max_buckets=10_000,
+    ):
+        self.capacity = capacity
+        self.refill_rate = 1 / refill_seconds
+        self.costs = DEFAULT_COSTS if costs is None else costs
+        self.group_limits = (
+            DEFAULT_GROUP_LIMITS if group_limits is None else group_limits
+        )
+        self.buckets = LRUCache(maxsize=max_buckets)
+        # До якого моменту користувач уже попереджений про обмеження
+        self.warned_until = LRUCache(maxsize=max_buckets)
+
+    def _bucket(self, key, capacity, refill_rate, now):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(capacity, refill_rate, now)
+        return bucket
+
+    def check(self, user_id, text):
+        """Списує токени за команду; повертає 0 або секунди очікування"""
+        text = (text or "").strip()
+        group = COMMAND_GROUPS.get(text)
+        if group is None and text.startswith("/"):
+            # Команда з аргументами або з іменем бота: /export xlsx, /update_db@bot
+            command = text.split(maxsplit=1)[0].split("@")[0]
+            group = COMMAND_GROUPS.get(command)
+        cost = self.costs.get(group, 1)
+
+        now = time.monotonic()
+        buckets = [
+            (self._bucket(user_id, self.capacity, self.refill_rate, now), cost),
+        ]
+        if group in self.group_limits:
+            capacity, seconds = self.group_limits[group]
+            group_bucket = self._bucket((user_id, group), capacity, 1 / seconds, now)
+            buckets.append((group_bucket, 1))
+
+        wait = 0.0
+        for bucket, bucket_cost in buckets:
+            bucket.refill(now)
+            wait = max(wait, bucket.wait_time(bucket_cost))
+        if wait:
+            return wait
+
+        for bucket, bucket_cost in buckets:
+            bucket.tokens -= bucket_cost
+        return 0.0
+
+    async def __call__(self, handler, event, data):
+        if not isinstance(event, Message) or event.from_user is None:
+            return await handler(event, data)
+
+        user_id = event.from_user.id
+        wait = self.check(user_id, event.text)
+        if wait:
+            now = time.monotonic()
+            if self.warned_until.get(user_id, 0.0) <= now:
+                self.warned_until[user_id] = now + wait
+                await event.answer(
+                    f"⏳ Забагато запитів. Спробуйте знову через {math.ceil(wait)} с."
+                )
+            return None
+
+        return await handler(event, data)
@@ -0,0 +1,144 @@
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson необов'язковий, з ним розбір JSON у кілька разів швидший
+    orjson = None
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+
+TRON_ADDRESS_PREFIX = 0x41
+
+
+def b58decode(value: str) -> bytes:
+    """Декодує рядок base58 у байти"""
+    number = 0
+    for char in value:
+        number = number * 58 + BASE58_INDEX[char]
+
+    raw = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    leading_zeros = len(value) - len(value.lstrip("1"))
+    return b"\x00" * leading_zeros + raw
+
+
+def b58encode(raw: bytes) -> str:
+    """Кодує байти у рядок base58"""
+    number = int.from_bytes(raw, "big")
+    chars = []
+    while number:
+        number, remainder = divmod(number, 58)
+        chars.append(BASE58_ALPHABET[remainder])
+
+    leading_zeros = len(raw) - len(raw.lstrip(b"\x00"))
+    return "1" * leading_zeros + "".join(reversed(chars))
+
+
+def _checksum(payload: bytes) -> bytes:
+    return hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+
+
+def is_valid_tron_address(address: str) -> bool:
+    """Перевіряє адресу TRON (base58check, префікс 0x41) без запитів до мережі"""
+    if len(address) != 34 or not address.startswith("T"):
+        return False
+    try:
+        raw = b58decode(address)
+    except KeyError:
+        return False
+
+    if len(raw) != 25 or raw[0] != TRON_ADDRESS_PREFIX:
+        return False
+    return _checksum(raw[:21]) == raw[21:]
+
+
+def hex_to_base58(hex_address: str) -> str:
+    """Перетворює hex-адресу TRON (41...) у формат base58check (T...)"""
+    payload = bytes.fromhex(hex_address)
+    return b58encode(payload + _checksum(payload))
+
+
+def base58_to_hex(address: str) -> str:
+    """Перетворює адресу TRON T... у hex-формат (41...)"""
+    return b58decode(address)[:21].hex()
+
+
+# Токен TRX не має контракту, Tronscan позначає його як "_"
+TRX_TOKEN_ID = "_"
+USDT_CONTRACT = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+
+DEFAULT_TOKENS = (
+    f"USDT:{USDT_CONTRACT}:6,"
+    "USDC:TEkxiTehnzSmSe2XqrBj4w32RUN966rdz8:6,"
+    f"TRX:{TRX_TOKEN_ID}:6"
+)
+
+
+def parse_tokens(spec: str):
+    """Розбирає список токенів "SYMBOL:contract:decimals,..." у {contract: (symbol, decimals)}"""
+    tokens = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        symbol, contract, decimals = item.strip().split(":")
+        tokens[contract] = (symbol, int(decimals))
+    return tokens
+
+
+def parse_account_balances(data: dict, tokens: dict):
+    """Витягує баланси всіх відстежуваних токенів з відповіді Tronscan /api/account.
+
+    Повертає {contract: balance}; токени, яких немає на гаманці, мають баланс 0.
+    """
+    balances = {contract: 0 for contract in tokens}
+
+    if TRX_TOKEN_ID in tokens:
+        balances[TRX_TOKEN_ID] = (
+            int(data.get("balance", 0)) / 10 ** tokens[TRX_TOKEN_ID][1]
+        )
+
+    for token in data.get("trc20token_balances", []):
+        contract = token.get("tokenId")
+        if contract in tokens:
+            decimals = int(token.get("tokenDecimal", tokens[contract][1]))
+            balances[contract] = int(token["balance"]) / 10**decimals
+
+    return balances
+
+
+def loads(raw):
+    """Розбирає JSON (bytes або str) через orjson, якщо він встановлений, інакше json"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def trongrid_to_tronscan(data):
+    """Приводить відповідь TronGrid /v1/accounts до формату Tronscan /api/account"""
+    accounts = data.get("data") or [{}]
+    account = accounts[0]
+    return {
+        "balance": account.get("balance", 0),
+        "trc20token_balances": [
+            {"tokenId": contract, "balance": amount}
+            for token in account.get("trc20", [])
+            for contract, amount in token.items()
+        ],
+    }
+
+
+# Помилки розбору обрізаної чи неочікуваної відповіді endpoint'а
+DECODE_ERRORS = (ValueError, TypeError, KeyError, AttributeError)
+
+
+def decode_account_balances(raw, tokens, kind="tronscan"):
+    """Розбирає сиру відповідь endpoint'а (bytes) одразу в {contract: balance}.
+
+    З усього акаунта (списки токенів, дозволи, ресурси) використовуються лише
+    баланс TRX і записи відстежуваних TRC20 токенів.
+    """
+    data = loads(raw)
+    if kind == "trongrid":
+        data = trongrid_to_tronscan(data)
+    return parse_account_balances(data, tokens)
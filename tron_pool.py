@@ -0,0 +1,313 @@
+import logging
+import math
+import threading
+import time
+
+from tron import DECODE_ERRORS, loads, trongrid_to_tronscan
+
+API_KEY_HEADER = "TRON-PRO-API-KEY"
+
+# Скільки помилок поспіль виключають учасника з пулу та на скільки секунд
+EJECT_AFTER_FAILURES = 3
+EJECT_SECONDS = 30
+MAX_EJECT_SECONDS = 600
+# Скільки найдовше чекати повернення учасника, якщо виключені всі
+MAX_EJECTED_WAIT = 10
+
+# Адреса для перевірки здоров'я учасників (контракт USDT має акаунт у мережі)
+HEALTH_CHECK_ADDRESS = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+
+
+class EndpointError(Exception):
+    """Усі учасники пулу не змогли віддати відповідь"""
+
+
+class PoolMember:
+    """Один endpoint (Tronscan, TronGrid або власна нода) зі своїм ключем і лімітом"""
+
+    __slots__ = (
+        "kind",
+        "url",
+        "api_key",
+        "rps",
+        "weight",
+        "current_weight",
+        "tokens",
+        "refilled_at",
+        "failures",
+        "eject_seconds",
+        "ejected_until",
+        "throttled",
+        "requests",
+        "errors",
+    )
+
+    def __init__(self, kind, url, api_key=None, rps=0, weight=1):
+        if kind not in ("tronscan", "trongrid"):
+            raise ValueError(f"Невідомий тип endpoint: {kind}")
+        self.kind = kind
+        self.url = url
+        self.api_key = api_key or None
+        self.rps = rps
+        self.weight = weight
+        self.current_weight = 0
+        self.tokens = max(1.0, rps)
+        self.refilled_at = time.monotonic()
+        self.failures = 0
+        self.eject_seconds = EJECT_SECONDS
+        self.ejected_until = 0.0
+        # Виключений за 429: сервер сам назвав час повернення в Retry-After
+        self.throttled = False
+        self.requests = 0
+        self.errors = 0
+
+    def __repr__(self):
+        return f"<PoolMember {self.kind} {self.url}>"
+
+    def refill(self, now):
+        """Поповнює бюджет запитів; повертає секунди до наступного доступного запиту"""
+        if not self.rps:
+            return 0.0
+        capacity = max(1.0, self.rps)
+        self.tokens = min(capacity, self.tokens + (now - self.refilled_at) * self.rps)
+        self.refilled_at = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rps
+
+    def request(self, address, timeout):
+        """Запитує акаунт і повертає сиру відповідь (bytes) без розбору JSON"""
+        import requests  # ~0.2 с імпорту, тож не під час запуску бота
+
+        headers = {API_KEY_HEADER: self.api_key} if self.api_key else None
+
+        if self.kind == "trongrid":
+            url = f"{self.url.rstrip('/')}/v1/accounts/{address}"
+        else:
+            url = f"{self.url}{address}"
+
+        response = requests.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        raw = response.content
+        # Дешева перевірка, що це JSON-об'єкт: HTML-сторінка проксі чи помилки
+        # перемикає на іншого учасника навіть без повного розбору (decode)
+        if raw.lstrip()[:1] != b"{":
+            raise ValueError(f"Відповідь {self.url} не є JSON-об'єктом")
+        return raw
+
+
+def _decode_account(kind, raw):
+    """Акаунт у форматі Tronscan /api/account з сирої відповіді"""
+    data = loads(raw)
+    if kind == "trongrid":
+        return trongrid_to_tronscan(data)
+    return data
+
+
+def _retry_after(response):
+    """Секунди з заголовка Retry-After (або типовий час виключення)"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return EJECT_SECONDS
+
+
+class EndpointPool:
+    """Пул endpoint'ів з ключами: зважений round-robin, ліміти та виключення збійних.
+
+    Методи синхронні та потокобезпечні - запити виконуються у пулі потоків.
+    """
+
+    def __init__(self, members, timeout=5):
+        if not members:
+            raise ValueError("Пул endpoint'ів порожній")
+        self.members = list(members)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec, timeout=5):
+        """Створює пул з рядка "kind|url|api_key|rps|weight;..."
+
+        Порожні api_key, rps та weight можна пропустити.
+        """
+        members = []
+        for item in spec.split(";"):
+            if not item.strip():
+                continue
+            fields = [field.strip() for field in item.split("|")]
+            fields += [""] * (5 - len(fields))
+            kind, url, api_key, rps, weight = fields[:5]
+            members.append(
+                PoolMember(
+                    kind,
+                    url,
+                    api_key,
+                    rps=float(rps) if rps else 0,
+                    weight=int(weight) if weight else 1,
+                )
+            )
+        return cls(members, timeout)
+
+    @property
+    def concurrency(self):
+        """Скільки запитів варто виконувати паралельно, щоб вичерпати бюджет пулу"""
+        return sum(max(1, math.ceil(member.rps)) for member in self.members)
+
+    def _acquire(self, exclude):
+        """Обирає учасника (smooth weighted round-robin) і списує одиницю бюджету.
+
+        Якщо всі учасники виключені, чекає повернення першого з них (не довше
+        MAX_EJECTED_WAIT), а інакше повертає None без жодного запиту.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                remaining = [member for member in self.members if member not in exclude]
+                candidates = [
+                    member for member in remaining if member.ejected_until <= now
+                ]
+                if not remaining:
+                    return None
+
+                wait = math.inf
+                ready = []
+                if candidates:
+                    for member in candidates:
+                        member_wait = member.refill(now)
+                        if member_wait:
+                            wait = min(wait, member_wait)
+                        else:
+                            ready.append(member)
+                else:
+                    wait = min(member.ejected_until for member in remaining) - now
+                    if wait > MAX_EJECTED_WAIT:
+                        return None
+
+                if ready:
+                    total = sum(member.weight for member in ready)
+                    for member in ready:
+                        member.current_weight += member.weight
+                    chosen = max(ready, key=lambda member: member.current_weight)
+                    chosen.current_weight -= total
+                    if chosen.rps:
+                        chosen.tokens -= 1
+                    chosen.requests += 1
+                    return chosen
+
+            time.sleep(wait)
+
+    def report_success(self, member):
+        with self._lock:
+            member.failures = 0
+            member.eject_seconds = EJECT_SECONDS
+            member.ejected_until = 0.0
+            member.throttled = False
+
+    def report_failure(self, member, retry_after=None):
+        """Рахує помилку; після кількох поспіль або при throttling виключає учасника"""
+        with self._lock:
+            member.errors += 1
+            now = time.monotonic()
+            if member.ejected_until > now:
+                # Відповідь на запит, відправлений до виключення. Новий
+                # Retry-After, довший за поточне виключення, його подовжує
+                if retry_after is not None and now + retry_after > member.ejected_until:
+                    member.ejected_until = now + retry_after
+                    member.throttled = True
+                return
+            member.failures += 1
+            if retry_after is None and member.failures < EJECT_AFTER_FAILURES:
+                return
+
+            seconds = retry_after if retry_after is not None else member.eject_seconds
+            member.ejected_until = time.monotonic() + seconds
+            member.throttled = retry_after is not None
+            member.eject_seconds = min(member.eject_seconds * 2, MAX_EJECT_SECONDS)
+            # Після повернення в пул одна помилка знову виключає учасника
+            member.failures = EJECT_AFTER_FAILURES - 1
+
+        logging.warning(
+            "⛔ Endpoint %s виключено з пулу на %.0f с", member.url, seconds
+        )
+
+    def fetch_account(self, address):
+        """Отримує акаунт через пул у форматі Tronscan /api/account"""
+        return self.fetch_raw(address, _decode_account)[1]
+
+    def fetch_raw(self, address, decode=None):
+        """Отримує сиру відповідь (kind, bytes); при помилці пробує наступного учасника.
+
+        З decode(kind, raw) відповідь розбирається одразу і повертається
+        (kind, результат decode); відповідь, яка не розбирається (обрізана,
+        не того формату), теж рахується помилкою учасника і перемикає на
+        наступного.
+        """
+        import requests
+
+        tried = set()
+        last_error = None
+
+        while True:
+            member = self._acquire(tried)
+            if member is None:
+                if last_error is None:
+                    raise EndpointError("Усі endpoint'и тимчасово виключені з пулу")
+                raise EndpointError(f"Жоден endpoint не відповів: {last_error}")
+            tried.add(member)
+
+            try:
+                raw = member.request(address, self.timeout)
+                if decode is not None:
+                    raw = decode(member.kind, raw)
+            except requests.HTTPError as e:
+                last_error = e
+                status = e.response.status_code if e.response is not None else None
+                if status == 429:
+                    self.report_failure(member, _retry_after(e.response))
+                else:
+                    self.report_failure(member)
+            except (requests.RequestException, *DECODE_ERRORS) as e:
+                last_error = e
+                self.report_failure(member)
+            else:
+                self.report_success(member)
+                return member.kind, raw
+
+    def _charge_probe(self, member):
+        """Списує одиницю бюджету на пробний запит; False, якщо бюджет вичерпано"""
+        with self._lock:
+            if member.refill(time.monotonic()):
+                return False
+            if member.rps:
+                member.tokens -= 1
+            member.requests += 1
+            return True
+
+    def check_health(self):
+        """Перевіряє виключених учасників тестовим запитом і повертає здорових у пул.
+
+        Учасники, виключені за 429, не перевіряються: вони повертаються самі,
+        коли мине час з Retry-After. Пробний запит списується з бюджету
+        учасника, а якщо бюджет вичерпано, перевірка переноситься.
+        """
+        import requests
+
+        now = time.monotonic()
+        for member in self.members:
+            if member.ejected_until <= now or member.throttled:
+                continue
+            if not self._charge_probe(member):
+                continue
+            try:
+                member.request(HEALTH_CHECK_ADDRESS, self.timeout)
+            except (requests.RequestException, ValueError):
+                continue
+            self.report_success(member)
+            logging.info("✅ Endpoint %s повернуто в пул", member.url)
+
+    def stats(self):
+        """Стан учасників для логів: (url, запити, помилки, виключений)"""
+        now = time.monotonic()
+        return [
+            (member.url, member.requests, member.errors, member.ejected_until > now)
+            for member in self.members
+        ]
@@ -0,0 +1,50 @@
+import csv
+import io
+
+from tron import is_valid_tron_address
+
+HEADER_NAMES = {"address", "адреса"}
+
+
+def parse_wallet_file(text: str, filename: str = ""):
+    """Розбирає CSV/TXT зі списком гаманців.
+
+    Кожен рядок: "Назва,Адреса" (CSV) або "Назва Адреса" (TXT). Рядок лише з
+    адресою теж приймається, тоді назвою стає сама адреса. Повертає кортеж
+    (accepted, rejected), де accepted - список (name, address), а rejected -
+    список (номер рядка, рядок, причина).
+    """
+    if filename.lower().endswith(".csv"):
+        try:
+            dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        rows = (
+            [field.strip() for field in row if field.strip()]
+            for row in csv.reader(io.StringIO(text), dialect)
+        )
+    else:
+        rows = (line.strip().rsplit(maxsplit=1) for line in text.splitlines())
+
+    accepted = []
+    rejected = []
+    seen = set()
+
+    for line_number, fields in enumerate(rows, start=1):
+        if not fields:
+            continue
+
+        address = fields[-1]
+        name = " ".join(fields[:-1]) or address
+        if address.lower() in HEADER_NAMES:
+            continue
+
+        if not is_valid_tron_address(address):
+            rejected.append((line_number, address, "невірна адреса"))
+        elif address in seen:
+            rejected.append((line_number, address, "дублікат у файлі"))
+        else:
+            seen.add(address)
+            accepted.append((name, address))
+
+    return accepted, rejected
@@ -0,0 +1,206 @@
+from array import array
+
+# Адреса TRON у base58 завжди має 34 ASCII-символи
+ADDRESS_WIDTH = 34
+
+_EMPTY = -1
+_DELETED = -2
+# Позначка вільного слота в списку назв
+_FREE = object()
+
+
+class WalletRegistry:
+    """Реєстр гаманців у пам'яті процесу, дзеркало таблиці wallets.
+
+    Дані зберігаються по колонках: user_id та баланси у типізованих масивах,
+    адреси - байтами фіксованої ширини в одному bytearray, назви - у списку.
+    Індекс адрес - хеш-таблиця з відкритою адресацією в array("q") замість
+    dict, тож на гаманець не створюється жодного окремого об'єкта адреси.
+    Адреси нестандартної довжини зберігаються окремо в _odd. Слот видаленого
+    гаманця звільняється і повторно використовується при наступному додаванні.
+    """
+
+    __slots__ = (
+        "_user_ids",
+        "_balances",
+        "_names",
+        "_blob",
+        "_odd",
+        "_table",
+        "_used",
+        "_count",
+        "_by_user",
+        "_free",
+        "loaded",
+    )
+
+    def __init__(self):
+        self._user_ids = array("q")
+        self._balances = array("d")
+        self._names = []
+        self._blob = bytearray()
+        self._odd = {}
+        self._table = array("q", [_EMPTY]) * 8
+        self._used = 0
+        self._count = 0
+        self._by_user = {}
+        self._free = []
+        self.loaded = False
+
+    def load(self, rows):
+        """Повністю перезавантажує реєстр з рядків (user_id, name, address, last_balance)"""
+        self.__init__()
+        for user_id, name, address, last_balance in rows:
+            self.add(user_id, name, address, last_balance)
+        self.loaded = True
+
+    def _address(self, slot):
+        if self._odd and slot in self._odd:
+            return self._odd[slot]
+        start = slot * ADDRESS_WIDTH
+        return self._blob[start : start + ADDRESS_WIDTH].decode("ascii")
+
+    def _find(self, address):
+        """Позиція адреси в хеш-таблиці або -1"""
+        table = self._table
+        mask = len(table) - 1
+        position = hash(address) & mask
+        while True:
+            slot = table[position]
+            if slot == _EMPTY:
+                return -1
+            if slot != _DELETED and self._address(slot) == address:
+                return position
+            position = (position + 1) & mask
+
+    def _insert(self, address, slot):
+        table = self._table
+        mask = len(table) - 1
+        position = hash(address) & mask
+        while table[position] >= 0:
+            position = (position + 1) & mask
+        if table[position] == _EMPTY:
+            self._used += 1
+        table[position] = slot
+
+    def _resize(self):
+        # Заповненість таблиці (разом з видаленими позиціями) не більше 2/3
+        size = 8
+        while size < (self._count + 1) * 2:
+            size *= 2
+        old_table = self._table
+        self._table = array("q", [_EMPTY]) * size
+        self._used = 0
+        for slot in old_table:
+            if slot >= 0:
+                self._insert(self._address(slot), slot)
+
+    def add(self, user_id, name, address, balance=0.0):
+        """Додає гаманець у реєстр; повертає False, якщо адреса вже є"""
+        if self._find(address) >= 0:
+            return False
+
+        user_id = user_id or 0
+        balance = balance or 0.0
+        odd = len(address) != ADDRESS_WIDTH or not address.isascii()
+        encoded = bytes(ADDRESS_WIDTH) if odd else address.encode("ascii")
+
+        if self._free:
+            slot = self._free.pop()
+            self._user_ids[slot] = user_id
+            self._balances[slot] = balance
+            self._names[slot] = name
+            start = slot * ADDRESS_WIDTH
+            self._blob[start : start + ADDRESS_WIDTH] = encoded
+        else:
+            slot = len(self._names)
+            self._user_ids.append(user_id)
+            self._balances.append(balance)
+            self._names.append(name)
+            self._blob += encoded
+        if odd:
+            self._odd[slot] = address
+
+        if (self._used + 1) * 3 > len(self._table) * 2:
+            self._resize()
+        self._insert(address, slot)
+        self._count += 1
+        self._by_user.setdefault(user_id, array("q")).append(slot)
+        return True
+
+    def remove(self, address):
+        """Видаляє гаманець з реєстру; повертає False, якщо адреси немає"""
+        position = self._find(address)
+        if position < 0:
+            return False
+        slot = self._table[position]
+        self._table[position] = _DELETED
+        self._count -= 1
+
+        user_id = self._user_ids[slot]
+        slots = self._by_user[user_id]
+        slots.remove(slot)
+        if not slots:
+            del self._by_user[user_id]
+
+        self._names[slot] = _FREE
+        self._balances[slot] = 0.0
+        self._odd.pop(slot, None)
+        self._free.append(slot)
+        return True
+
+    def _slot(self, address):
+        position = self._find(address)
+        return None if position < 0 else self._table[position]
+
+    def set_balance(self, address, balance):
+        """Оновлює останній відомий баланс гаманця"""
+        slot = self._slot(address)
+        if slot is not None:
+            self._balances[slot] = balance
+
+    def get_balance(self, address):
+        slot = self._slot(address)
+        return None if slot is None else self._balances[slot]
+
+    def get(self, address):
+        """Повертає (name, address, last_balance) або None"""
+        slot = self._slot(address)
+        if slot is None:
+            return None
+        return self._names[slot], address, self._balances[slot]
+
+    def all(self):
+        """Знімок усіх гаманців у форматі get_all_wallets()"""
+        names, balances, address = self._names, self._balances, self._address
+        return [
+            (name, address(slot), balances[slot])
+            for slot, name in enumerate(names)
+            if name is not _FREE
+        ]
+
+    def for_user(self, user_id):
+        """Знімок гаманців користувача у форматі get_user_wallets()"""
+        names, balances, address = self._names, self._balances, self._address
+        return [
+            (names[slot], address(slot), balances[slot])
+            for slot in self._by_user.get(user_id, ())
+        ]
+
+    def count(self, user_id=None):
+        """Кількість гаманців (усіх або користувача) без побудови знімка"""
+        if user_id is None:
+            return self._count
+        return len(self._by_user.get(user_id, ()))
+
+    def total_balance(self):
+        return sum(self._balances)
+
+    def __contains__(self, address):
+        return self._find(address) >= 0
+
+    def __len__(self):
+        return self._count
+
+
+registry = WalletRegistry()